@@ -4,6 +4,7 @@
 """
 import random
 import math
+import heapq
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from collections import Counter, defaultdict
@@ -247,7 +248,7 @@ def recommend_trending_papers(papers: List[Dict[str, Any]], limit: int = 3) -> L
                 "type": "trending"
             })
     
-    return sorted(recommendations, key=lambda x: x["score"], reverse=True)[:limit]
+    return heapq.nlargest(limit, recommendations, key=lambda x: x["score"])
 
 def rerank_search_results(user_id: str, results: List[Dict[str, Any]], 
                          user_data: Dict[str, Any] = None) -> List[Dict[str, Any]]:
@@ -265,27 +266,28 @@ def rerank_search_results(user_id: str, results: List[Dict[str, Any]],
     if not user_data:
         return results
     
-    user_interests = user_data.get("research_interests", [])
-    reading_history = user_data.get("reading_history", [])
-    followed_authors = user_data.get("followed_authors", [])
+    # 用户侧特征在循环外只构建一次
+    user_interests = [interest.lower() for interest in user_data.get("research_interests", [])]
+    reading_history = set(user_data.get("reading_history", []))
+    followed_authors = set(user_data.get("followed_authors", []))
     
     # 为每个结果计算个性化分数
     for result in results:
         personalization_score = 0.0
         
         # 基于研究兴趣调整
-        paper_keywords = result.get("keywords", [])
-        paper_field = result.get("research_field", "")
+        paper_keywords = [keyword.lower() for keyword in result.get("keywords", [])]
+        paper_field = (result.get("research_field") or "").lower()
         for interest in user_interests:
-            if interest.lower() in paper_field.lower():
+            if interest in paper_field:
                 personalization_score += 0.3
             for keyword in paper_keywords:
-                if interest.lower() in keyword.lower():
+                if interest in keyword:
                     personalization_score += 0.2
         
         # 基于关注作者调整
         paper_authors = result.get("authors", [])
-        author_match = len(set(paper_authors) & set(followed_authors))
+        author_match = len(followed_authors.intersection(paper_authors))
         personalization_score += author_match * 0.4
         
         # 基于阅读历史调整（避免重复）
@@ -2,8 +2,8 @@
 用户认证API接口
 """
 from datetime import timedelta
-from typing import Optional
-from fastapi import APIRouter, HTTPException, status, Depends
+from typing import Optional, Dict, Any
+from fastapi import APIRouter, HTTPException, status, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from ..models.user import UserCreate, UserLogin, User, UserPublic, Token, UserUpdate
 from ..core.security import (
@@ -28,7 +28,7 @@ async def register_user(user_data: UserCreate):
     - **research_interests**: 研究兴趣列表（可选）
     """
     # 检查用户名是否已存在
-    existing_user = await user_manager.get_user_by_username(user_data.username)
+    existing_user = await user_manager.get_user_auth_record(user_data.username)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -71,8 +71,8 @@ async def login(user_credentials: UserLogin):
     
     返回JWT访问令牌
     """
-    # 验证用户凭据
-    user = await user_manager.get_user_by_username(user_credentials.username)
+    # 验证用户凭据（只需要ID和密码哈希）
+    user = await user_manager.get_user_auth_record(user_credentials.username)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -101,9 +101,11 @@ async def login(user_credentials: UserLogin):
         "token_type": "bearer"
     }
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
+async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
     """
     获取当前登录用户
+    
+    查询到的用户记录会保存在 request.state.user_data 中，供同一请求内的其他依赖复用
     """
     token = credentials.credentials
     payload = verify_token(token)
@@ -116,8 +118,17 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             detail="用户不存在"
         )
     
+    request.state.user_data = user
     return User(**user)
 
+async def get_current_user_data(request: Request, current_user: User = Depends(get_current_user)) -> Dict[str, Any]:
+    """
+    获取当前登录用户的原始数据记录
+    
+    复用 get_current_user 已查询到的记录，避免在接口中再次按ID查询用户
+    """
+    return request.state.user_data
+
 @router.get("/me", response_model=UserPublic, summary="获取当前用户信息")
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """
@@ -2,15 +2,25 @@
 作者相关API接口 - 更新版本
 从论文数据中聚合作者信息
 """
-from typing import List, Optional
+from bisect import bisect_left
+from typing import Iterable, List, Optional
 from fastapi import APIRouter, HTTPException, Depends, Query
-from ..models.paper import Author, AuthorSummary, PaperSummary
+from ..models.paper import Author, AuthorSummary, PaperSummary, paper_to_summary
 from ..models.user import User
 from ..api.auth import get_current_user
 from ..db.database import db, user_manager
 
 router = APIRouter(prefix="/authors", tags=["作者"])
 
+def compute_h_index(citation_counts: Iterable[int]) -> int:
+    """
+    计算h-index：引用数降序排列后，满足第i篇引用数不小于i的最大i
+    
+    排序后"第i篇引用数小于i"对i单调，用二分查找定位第一个不满足的位置，无需逐篇比较
+    """
+    citations = sorted(citation_counts, reverse=True)
+    return bisect_left(range(len(citations)), True, key=lambda i: citations[i] <= i)
+
 @router.get("/search", response_model=List[AuthorSummary], summary="搜索作者")
 async def search_authors(
     query: str = Query(..., description="作者姓名搜索词"),
@@ -54,13 +64,7 @@ async def search_authors(
     author_summaries = []
     for author_name, data in list(authors_data.items())[:limit]:
         # 计算简化的h-index
-        citations_list = sorted([p.get("citation_count", 0) for p in data["papers"]], reverse=True)
-        h_index = 0
-        for i, citations in enumerate(citations_list, 1):
-            if citations >= i:
-                h_index = i
-            else:
-                break
+        h_index = compute_h_index(p.get("citation_count", 0) for p in data["papers"])
         
         summary = AuthorSummary(
             id=f"author_{author_name.replace(' ', '_')}",
@@ -130,17 +134,7 @@ async def get_author_papers(
     # 转换为PaperSummary格式
     paper_summaries = []
     for paper in papers:
-        summary = PaperSummary(
-            id=paper["id"],
-            short_id=paper.get("short_id"),
-            title=paper["title"],
-            author_names=paper["author_names"],
-            year=paper["year"],
-            journal=paper["journal"],
-            citation_count=paper["citation_count"],
-            truth_value_score=paper.get("truth_value_score"),
-            research_field=paper["research_field"]
-        )
+        summary = paper_to_summary(paper)
         paper_summaries.append(summary)
     
     return paper_summaries
@@ -190,13 +184,7 @@ async def get_author_statistics(author_name: str):
             journals[journal] = journals.get(journal, 0) + 1
     
     # 计算h-index
-    citations_list = sorted([p.get("citation_count", 0) for p in papers], reverse=True)
-    h_index = 0
-    for i, citations in enumerate(citations_list, 1):
-        if citations >= i:
-            h_index = i
-        else:
-            break
+    h_index = compute_h_index(p.get("citation_count", 0) for p in papers)
     
     return {
         "author_name": author_name,
@@ -346,13 +334,7 @@ async def get_popular_authors(
             continue
             
         # 计算h-index
-        citations_list = sorted([p.get("citation_count", 0) for p in data["papers"]], reverse=True)
-        h_index = 0
-        for i, citations in enumerate(citations_list, 1):
-            if citations >= i:
-                h_index = i
-            else:
-                break
+        h_index = compute_h_index(p.get("citation_count", 0) for p in data["papers"])
         
         summary = AuthorSummary(
             id=f"author_{author_name.replace(' ', '_')}",
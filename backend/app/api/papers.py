@@ -2,8 +2,8 @@
 论文相关API接口 - 更新版本
 """
 from typing import Optional, List
-from fastapi import APIRouter, HTTPException, Depends, Query
-from ..models.paper import Paper, PaperSummary, GraphData, GraphNode, GraphEdge, TruthValueResult, CitationNetwork
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from ..models.paper import Paper, PaperSummary, GraphData, GraphNode, GraphEdge, TruthValueResult, CitationNetwork, paper_to_summary
 from ..models.user import User
 from ..api.auth import get_current_user
 from ..db.database import db, user_manager
@@ -26,28 +26,9 @@ async def get_papers(
     - **sort_by**: 排序方式（date: 发表时间, citation: 引用数, truth_value: 真值分数）
     - **order**: 排序顺序（asc: 升序, desc: 降序）
     """
-    # 获取数据时就进行分页
-    papers = await db.get_papers(limit=limit, offset=offset)
-    
-    # 转换为PaperSummary格式
-    paper_summaries = []
-    for paper in papers:
-        if not paper:
-            continue
-        summary = PaperSummary(
-            id=paper["id"],
-            short_id=paper.get("short_id"),
-            title=paper["title"],
-            author_names=paper["author_names"],
-            year=paper["year"],
-            journal=paper["journal"],
-            citation_count=paper["citation_count"],
-            truth_value_score=paper.get("truth_value_score"),
-            research_field=paper["research_field"]
-        )
-        paper_summaries.append(summary)
-    
-    return paper_summaries
+    # 获取数据时就进行分页；数据库直接返回PaperSummary格式的JSON，原样作为响应体
+    content = await db.get_paper_summaries_json(limit=limit, offset=offset)
+    return Response(content=content, media_type="application/json")
 
 @router.get("/detail", response_model=Paper, summary="获取论文详情")
 async def get_paper_detail(paper_id: str = Query(..., description="论文ID")):
@@ -91,17 +72,7 @@ async def get_paper_references(paper_id: str = Query(..., description="论文ID"
     for ref_id in paper.get("references", []):
         ref_paper = await db.get_paper_by_id(ref_id)
         if ref_paper:
-            summary = PaperSummary(
-                id=ref_paper["id"],
-                short_id=ref_paper.get("short_id"),
-                title=ref_paper["title"],
-                author_names=ref_paper["author_names"],
-                year=ref_paper["year"],
-                journal=ref_paper["journal"],
-                citation_count=ref_paper["citation_count"],
-                truth_value_score=ref_paper.get("truth_value_score"),
-                research_field=ref_paper["research_field"]
-            )
+            summary = paper_to_summary(ref_paper)
             references.append(summary)
     
     return references
@@ -121,17 +92,7 @@ async def get_paper_citations(paper_id: str = Query(..., description="论文ID")
     for cite_id in paper.get("cited_by", []):
         cite_paper = await db.get_paper_by_id(cite_id)
         if cite_paper:
-            summary = PaperSummary(
-                id=cite_paper["id"],
-                short_id=cite_paper.get("short_id"),
-                title=cite_paper["title"],
-                author_names=cite_paper["author_names"],
-                year=cite_paper["year"],
-                journal=cite_paper["journal"],
-                citation_count=cite_paper["citation_count"],
-                truth_value_score=cite_paper.get("truth_value_score"),
-                research_field=cite_paper["research_field"]
-            )
+            summary = paper_to_summary(cite_paper)
             citations.append(summary)
     
     return citations
@@ -152,7 +113,7 @@ async def get_similar_papers(
         raise HTTPException(status_code=404, detail="论文不存在")
     
     # 基于研究领域搜索相似论文
-    filters = {"research_field": paper["research_field"]}
+    filters = {"research_fields": [paper["research_field"]]} if paper["research_field"] else None
     similar_papers = await db.search_papers("", filters)
     
     # 移除当前论文并限制数量
@@ -161,17 +122,7 @@ async def get_similar_papers(
     # 转换为PaperSummary格式
     result = []
     for paper_data in filtered_papers:
-        summary = PaperSummary(
-            id=paper_data["id"],
-            short_id=paper_data.get("short_id"),
-            title=paper_data["title"],
-            author_names=paper_data["author_names"],
-            year=paper_data["year"],
-            journal=paper_data["journal"],
-            citation_count=paper_data["citation_count"],
-            truth_value_score=paper_data.get("truth_value_score"),
-            research_field=paper_data["research_field"]
-        )
+        summary = paper_to_summary(paper_data)
         result.append(summary)
     
     return result
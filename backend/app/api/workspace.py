@@ -1,88 +1,77 @@
 """
 个人工作台API接口
 """
-from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends, Query
+import asyncio
+import hashlib
+import json
+from datetime import date
+from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from ..models.user import User, Folder, FolderCreate, UserStats, Recommendation
-from ..models.paper import PaperSummary, AuthorSummary
-from ..api.auth import get_current_user
+from ..models.paper import PaperSummary, AuthorSummary, paper_to_summary, author_to_summary
+from ..api.auth import get_current_user, get_current_user_data
 from ..db.database import db, user_manager
 from ..algorithms.recommender import get_daily_recommendations
 
 router = APIRouter(prefix="/workspace", tags=["个人工作台"])
 
 @router.get("/dashboard", summary="获取工作台概览")
-async def get_workspace_dashboard(current_user: User = Depends(get_current_user)):
+async def get_workspace_dashboard(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    user_data: Dict[str, Any] = Depends(get_current_user_data)
+):
     """
     获取个人工作台的概览信息
-    """
-    user_data = await user_manager.get_user_by_id(current_user.id)
-    if not user_data:
-        raise HTTPException(status_code=404, detail="用户不存在")
-    
-    # 获取用户的收藏论文
-    bookmarked_papers = await user_manager.get_user_bookmarks(current_user.id)
-    
-    # 获取用户的文件夹
-    user_folders = await user_manager.get_user_folders(current_user.id)
     
-    # 获取关注的作者
-    followed_authors = await user_manager.get_followed_authors(current_user.id)
+    组装好的概览会按用户缓存，收藏、文件夹、关注、阅读记录等写操作会使缓存失效；
+    响应带有ETag，客户端可通过 If-None-Match 获得304响应
+    """
+    cached = user_manager.get_cached_dashboard(current_user.id)
+    if cached is None:
+        payload = jsonable_encoder(await build_dashboard_payload(current_user, user_data))
+        etag = '"%s"' % hashlib.sha1(
+            json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        user_manager.cache_dashboard(current_user.id, etag, payload)
+    else:
+        etag, payload = cached
     
-    # 获取阅读历史
-    reading_history = await user_manager.get_reading_history(current_user.id, limit=50)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=payload, headers=headers)
+
+async def build_dashboard_payload(current_user: User, user_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    组装工作台概览数据
     
-    # 统计信息
-    stats = UserStats(
-        total_bookmarks=len(bookmarked_papers),
-        total_folders=len(user_folders),
-        followed_authors_count=len(followed_authors),
-        reading_history_count=len(reading_history)
+    各部分数据互不依赖，分两轮用 asyncio.gather 并发查询（每个查询使用独立连接）
+    """
+    # 收藏论文、关注作者、统计信息和推荐列表
+    bookmarked_papers, followed_authors, stats_data, recommendations = await asyncio.gather(
+        user_manager.get_user_bookmarks(current_user.id),
+        user_manager.get_followed_authors(current_user.id),
+        user_manager.get_user_stats(current_user.id),
+        get_cached_daily_recommendations(current_user.id, user_data, limit=5)
     )
-    
-    # 最近收藏的论文
-    recent_bookmarks = []
-    for paper_id in bookmarked_papers[-5:]:  # 最近5篇
-        paper = await db.get_paper_by_id(paper_id)
-        if paper:
-            summary = PaperSummary(
-                id=paper["id"],
-                short_id=paper.get("short_id"),
-                title=paper["title"],
-                author_names=paper["author_names"],
-                year=paper["year"],
-                journal=paper["journal"],
-                citation_count=paper["citation_count"],
-                truth_value_score=paper.get("truth_value_score"),
-                research_field=paper["research_field"]
-            )
-            recent_bookmarks.append(summary)
-    
-    # 关注的作者
+    stats = UserStats(**stats_data)
+    
+    # 最近收藏的论文和关注作者的详情（从作者ID中提取作者姓名，批量获取信息）
+    recent_ids = bookmarked_papers[-5:]  # 最近5篇
+    author_names = [author_id.replace("author_", "").replace("_", " ") for author_id in followed_authors]
+    papers, authors = await asyncio.gather(
+        db.get_paper_summaries_by_ids(recent_ids),
+        db.get_authors_info(author_names)
+    )
+    recent_bookmarks = [paper_to_summary(papers[paper_id]) for paper_id in recent_ids if paper_id in papers]
     followed_authors_info = []
-    for author_id in followed_authors:
-        # 从作者ID中提取作者姓名并获取信息
-        author_name = author_id.replace("author_", "").replace("_", " ")
-        author = await db.get_author_info(author_name)
+    for author_name in author_names:
+        author = authors.get(author_name)
         if author:
-            summary = AuthorSummary(
-                id=author["id"],
-                name=author["name"],
-                affiliation=author["affiliation"],
-                research_areas=author["research_areas"],
-                h_index=author["h_index"],
-                citation_count=author["citation_count"],
-                paper_count=author["paper_count"]
-            )
-            followed_authors_info.append(summary)
-    
-    # 获取推荐列表
-    recommendations = get_daily_recommendations(
-        user_id=current_user.id,
-        user_data=user_data,
-        papers=await db.get_papers(limit=1000),  # 获取更多论文用于推荐
-        limit=5
-    )
+            followed_authors_info.append(author_to_summary(author))
     
     return {
         "user_stats": stats,
@@ -92,6 +81,24 @@ async def get_workspace_dashboard(current_user: User = Depends(get_current_user)
         "last_updated": user_data.get("last_login")
     }
 
+async def get_cached_daily_recommendations(user_id: str, user_data: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+    """
+    获取每日推荐，按 (用户, 数量, 日期, 是否个性化) 缓存
+    
+    缓存命中时无需加载候选论文和运行推荐算法；用户数据变化时由 user_manager 使缓存失效
+    """
+    key = (limit, date.today().isoformat(), bool(user_data))
+    recommendations = user_manager.get_cached_recommendations(user_id, key)
+    if recommendations is None:
+        recommendations = get_daily_recommendations(
+            user_id=user_id,
+            user_data=user_data,
+            papers=await db.get_papers(limit=1000),  # 获取更多论文用于推荐
+            limit=limit
+        )
+        user_manager.cache_recommendations(user_id, key, recommendations)
+    return recommendations
+
 @router.get("/bookmarks", response_model=List[PaperSummary], summary="获取收藏的论文")
 async def get_bookmarked_papers(
     current_user: User = Depends(get_current_user),
@@ -106,19 +113,10 @@ async def get_bookmarked_papers(
     - **limit**: 返回的论文数量限制
     - **offset**: 分页偏移量
     """
-    user_data = await user_manager.get_user_by_id(current_user.id)
-    if not user_data:
-        raise HTTPException(status_code=404, detail="用户不存在")
-    
     # 确定要返回的论文ID列表
     if folder_id:
         # 查找指定文件夹
-        user_folders = await user_manager.get_user_folders(current_user.id)
-        target_folder = None
-        for folder in user_folders:
-            if folder["id"] == folder_id:
-                target_folder = folder
-                break
+        target_folder = await user_manager.get_user_folder(current_user.id, folder_id)
         
         if not target_folder:
             raise HTTPException(status_code=404, detail="文件夹不存在")
@@ -134,25 +132,9 @@ async def get_bookmarked_papers(
     # 分页
     paginated_ids = paper_ids[offset:offset + limit]
     
-    # 获取论文详情
-    bookmarked_papers = []
-    for paper_id in paginated_ids:
-        paper = await db.get_paper_by_id(paper_id)
-        if paper:
-            summary = PaperSummary(
-                id=paper["id"],
-                short_id=paper.get("short_id"),
-                title=paper["title"],
-                author_names=paper["author_names"],
-                year=paper["year"],
-                journal=paper["journal"],
-                citation_count=paper["citation_count"],
-                truth_value_score=paper.get("truth_value_score"),
-                research_field=paper["research_field"]
-            )
-            bookmarked_papers.append(summary)
-    
-    return bookmarked_papers
+    # 批量获取论文详情，按原ID顺序返回
+    papers = await db.get_paper_summaries_by_ids(paginated_ids)
+    return [paper_to_summary(papers[paper_id]) for paper_id in paginated_ids if paper_id in papers]
 
 @router.get("/folders", response_model=List[Folder], summary="获取收藏夹列表")
 async def get_folders(current_user: User = Depends(get_current_user)):
@@ -160,7 +142,7 @@ async def get_folders(current_user: User = Depends(get_current_user)):
     获取用户的收藏夹列表（支持多层级结构）
     """
     user_folders = await user_manager.get_user_folders(current_user.id)
-    folders = [Folder(**folder) for folder in user_folders]
+    folders = [Folder.model_construct(**folder) for folder in user_folders]
     return folders
 
 @router.post("/folders", response_model=Folder, summary="创建收藏夹")
@@ -174,26 +156,21 @@ async def create_folder(
     - **name**: 收藏夹名称
     - **parent_id**: 父收藏夹ID（可选，用于创建子文件夹）
     """
-    user_data = await user_manager.get_user_by_id(current_user.id)
-    if not user_data:
-        raise HTTPException(status_code=404, detail="用户不存在")
+    # 只查询一次收藏夹列表，按ID和父文件夹建立索引
+    user_folders = await user_manager.get_user_folders(current_user.id)
+    folder_index = {folder["id"]: folder for folder in user_folders}
+    sibling_names = {
+        folder["name"] for folder in user_folders
+        if folder.get("parent_id") == folder_data.parent_id
+    }
     
     # 检查父文件夹是否存在（如果指定了parent_id）
-    if folder_data.parent_id:
-        user_folders = await user_manager.get_user_folders(current_user.id)
-        parent_exists = any(
-            folder["id"] == folder_data.parent_id 
-            for folder in user_folders
-        )
-        if not parent_exists:
-            raise HTTPException(status_code=404, detail="父文件夹不存在")
+    if folder_data.parent_id and folder_data.parent_id not in folder_index:
+        raise HTTPException(status_code=404, detail="父文件夹不存在")
     
     # 检查同级文件夹名称是否重复
-    user_folders = await user_manager.get_user_folders(current_user.id)
-    for folder in user_folders:
-        if (folder["name"] == folder_data.name and 
-            folder.get("parent_id") == folder_data.parent_id):
-            raise HTTPException(status_code=400, detail="同级目录下已存在同名文件夹")
+    if folder_data.name in sibling_names:
+        raise HTTPException(status_code=400, detail="同级目录下已存在同名文件夹")
     
     # 创建文件夹
     created_folder = await user_manager.create_folder(current_user.id, folder_data.model_dump())
@@ -216,23 +193,15 @@ async def update_folder(
     - **parent_id**: 新的父收藏夹ID（可选）
     """
     # 查找目标文件夹
-    user_folders = await user_manager.get_user_folders(current_user.id)
-    target_folder = None
-    for folder in user_folders:
-        if folder["id"] == folder_id:
-            target_folder = folder
-            break
+    target_folder = await user_manager.get_user_folder(current_user.id, folder_id)
     
     if not target_folder:
         raise HTTPException(status_code=404, detail="文件夹不存在")
     
     # 检查新父文件夹是否存在（如果指定了parent_id）
     if folder_data.parent_id and folder_data.parent_id != target_folder.get("parent_id"):
-        parent_exists = any(
-            folder["id"] == folder_data.parent_id 
-            for folder in user_folders
-        )
-        if not parent_exists:
+        parent_folder = await user_manager.get_user_folder(current_user.id, folder_data.parent_id)
+        if not parent_folder:
             raise HTTPException(status_code=404, detail="父文件夹不存在")
         
         # 防止循环引用（简化检查）
@@ -255,23 +224,22 @@ async def delete_folder(
     current_user: User = Depends(get_current_user)
 ):
     """
-    删除收藏夹（及其所有子文件夹）
+    删除收藏夹（收藏夹中的论文关联一并删除）
     
     - **folder_id**: 收藏夹ID
     """
     # 查找要删除的文件夹
-    user_folders = await user_manager.get_user_folders(current_user.id)
-    target_folder = None
-    for folder in user_folders:
-        if folder["id"] == folder_id:
-            target_folder = folder
-            break
+    target_folder = await user_manager.get_user_folder(current_user.id, folder_id)
     
     if not target_folder:
         raise HTTPException(status_code=404, detail="文件夹不存在")
     
-    # 删除文件夹 - 这里需要实现实际的删除逻辑
-    # 暂时返回成功，后续可以扩展
+    # 删除文件夹：收藏夹表中没有层级字段；只删除user_folders中的一行，folder_papers中的论文关联
+    # 由外键ON DELETE CASCADE一并删除（连接已开启PRAGMA foreign_keys=ON）
+    success = await user_manager.delete_folder(folder_id, current_user.id)
+    if not success:
+        raise HTTPException(status_code=500, detail="删除文件夹失败")
+    
     return {"message": "文件夹删除成功"}
 
 @router.post("/folders/{folder_id}/papers/{paper_id}", summary="将论文添加到收藏夹")
@@ -292,18 +260,16 @@ async def add_paper_to_folder(
         raise HTTPException(status_code=404, detail="论文不存在")
     
     # 查找目标文件夹
-    user_folders = await user_manager.get_user_folders(current_user.id)
-    target_folder = None
-    for folder in user_folders:
-        if folder["id"] == folder_id:
-            target_folder = folder
-            break
+    target_folder = await user_manager.get_user_folder(current_user.id, folder_id)
     
     if not target_folder:
         raise HTTPException(status_code=404, detail="文件夹不存在")
     
-    # 添加论文到文件夹 - 这里需要实现实际的添加逻辑
-    # 暂时返回成功，后续可以扩展
+    # 直接尝试插入，由插入语句本身判重，无需先查询文件夹中的论文列表
+    success = await user_manager.add_paper_to_folder(folder_id, paper_id)
+    if not success:
+        raise HTTPException(status_code=400, detail="论文已在收藏夹中")
+    
     return {"message": "论文已添加到收藏夹"}
 
 @router.delete("/folders/{folder_id}/papers/{paper_id}", summary="从收藏夹移除论文")
@@ -319,18 +285,16 @@ async def remove_paper_from_folder(
     - **paper_id**: 论文ID
     """
     # 查找目标文件夹
-    user_folders = await user_manager.get_user_folders(current_user.id)
-    target_folder = None
-    for folder in user_folders:
-        if folder["id"] == folder_id:
-            target_folder = folder
-            break
+    target_folder = await user_manager.get_user_folder(current_user.id, folder_id)
     
     if not target_folder:
         raise HTTPException(status_code=404, detail="文件夹不存在")
     
-    # 从文件夹移除论文 - 这里需要实现实际的移除逻辑
-    # 暂时返回成功，后续可以扩展
+    # 直接删除，根据受影响行数判断论文是否在收藏夹中
+    success = await user_manager.remove_paper_from_folder(folder_id, paper_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="论文不在该收藏夹中")
+    
     return {"message": "论文已从收藏夹移除"}
 
 @router.get("/followed-authors", response_model=List[AuthorSummary], summary="获取关注的作者")
@@ -340,22 +304,15 @@ async def get_followed_authors(current_user: User = Depends(get_current_user)):
     """
     
     followed_authors = await user_manager.get_followed_authors(current_user.id)
+    
+    # 从作者ID中提取作者姓名，批量获取信息
+    author_names = [author_id.replace("author_", "").replace("_", " ") for author_id in followed_authors]
+    authors = await db.get_authors_info(author_names)
     followed_authors_info = []
-    for author_id in followed_authors:
-        # 从作者ID中提取作者姓名并获取信息
-        author_name = author_id.replace("author_", "").replace("_", " ")
-        author = await db.get_author_info(author_name)
+    for author_name in author_names:
+        author = authors.get(author_name)
         if author:
-            summary = AuthorSummary(
-                id=author["id"],
-                name=author["name"],
-                affiliation=author["affiliation"],
-                research_areas=author["research_areas"],
-                h_index=author["h_index"],
-                citation_count=author["citation_count"],
-                paper_count=author["paper_count"]
-            )
-            followed_authors_info.append(summary)
+            followed_authors_info.append(author_to_summary(author))
     
     return followed_authors_info
 
@@ -371,30 +328,12 @@ async def get_reading_history(
     - **limit**: 返回的论文数量限制
     - **offset**: 分页偏移量
     """
-    # 获取阅读历史（倒序，最新的在前）
-    reading_history = await user_manager.get_reading_history(current_user.id, limit=1000)
-    reading_history = reading_history[::-1]
-    paginated_history = reading_history[offset:offset + limit]
-    
-    # 获取论文详情
-    history_papers = []
-    for paper_id in paginated_history:
-        paper = await db.get_paper_by_id(paper_id)
-        if paper:
-            summary = PaperSummary(
-                id=paper["id"],
-                short_id=paper.get("short_id"),
-                title=paper["title"],
-                author_names=paper["author_names"],
-                year=paper["year"],
-                journal=paper["journal"],
-                citation_count=paper["citation_count"],
-                truth_value_score=paper.get("truth_value_score"),
-                research_field=paper["research_field"]
-            )
-            history_papers.append(summary)
-    
-    return history_papers
+    # 获取阅读历史（数据库已按时间倒序，最新的在前），分页直接交给SQL
+    paginated_history = await user_manager.get_reading_history(current_user.id, limit=limit, offset=offset)
+    
+    # 批量获取论文详情，按原ID顺序返回
+    papers = await db.get_paper_summaries_by_ids(paginated_history)
+    return [paper_to_summary(papers[paper_id]) for paper_id in paginated_history if paper_id in papers]
 
 @router.post("/reading-history/{paper_id}", summary="添加阅读记录")
 async def add_reading_record(
@@ -427,29 +366,19 @@ async def get_personalized_recommendations(
     - **limit**: 推荐论文数量
     """
     # 获取推荐列表
-    recommendations = get_daily_recommendations(
-        user_id=current_user.id,
+    recommendations = await get_cached_daily_recommendations(
+        current_user.id,
         user_data={},  # 暂时使用空字典，后续可以扩展
-        papers=await db.get_papers(limit=1000),  # 获取更多论文用于推荐
         limit=limit
     )
     
-    # 获取推荐论文的详细信息
+    # 批量获取推荐论文的详细信息
+    papers = await db.get_paper_summaries_by_ids([rec["paper_id"] for rec in recommendations])
     recommended_papers = []
     for rec in recommendations:
-        paper = await db.get_paper_by_id(rec["paper_id"])
+        paper = papers.get(rec["paper_id"])
         if paper:
-            paper_summary = PaperSummary(
-                id=paper["id"],
-                short_id=paper.get("short_id"),
-                title=paper["title"],
-                author_names=paper["author_names"],
-                year=paper["year"],
-                journal=paper["journal"],
-                citation_count=paper["citation_count"],
-                truth_value_score=paper.get("truth_value_score"),
-                research_field=paper["research_field"]
-            )
+            paper_summary = paper_to_summary(paper)
             recommended_papers.append({
                 "paper": paper_summary,
                 "recommendation_score": rec["score"],
@@ -468,22 +397,5 @@ async def get_user_statistics(current_user: User = Depends(get_current_user)):
     """
     获取用户的详细统计信息
     """
-    # 获取用户的收藏论文
-    bookmarked_papers = await user_manager.get_user_bookmarks(current_user.id)
-    
-    # 获取用户的文件夹
-    user_folders = await user_manager.get_user_folders(current_user.id)
-    
-    # 获取关注的作者
-    followed_authors = await user_manager.get_followed_authors(current_user.id)
-    
-    # 获取阅读历史
-    reading_history = await user_manager.get_reading_history(current_user.id, limit=1000)
-    
-    return UserStats(
-        total_bookmarks=len(bookmarked_papers),
-        total_folders=len(user_folders),
-        followed_authors_count=len(followed_authors),
-        reading_history_count=len(reading_history)
-    )
+    return UserStats(**await user_manager.get_user_stats(current_user.id))
 
@@ -1,7 +1,11 @@
 """
 安全模块：密码处理、JWT token等
 """
-from datetime import datetime, timedelta
+import hashlib
+import hmac
+import time
+from datetime import timedelta
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from passlib.context import CryptContext
 from jose import JWTError, jwt
@@ -15,6 +19,10 @@ SECRET_KEY = "your-secret-key-here-change-in-production"  # 生产环境中应
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# 密钥和算法列表在导入时准备好，避免每次编码/解码时重复转换
+_SECRET_KEY_BYTES = SECRET_KEY.encode()
+_ALGORITHMS = [ALGORITHM]
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     验证密码
@@ -52,15 +60,34 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
         JWT令牌
     """
     to_encode = data.copy()
+    # 直接计算Unix时间戳，JWT的exp本身就是整数秒
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = int(time.time() + expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY_BYTES, algorithm=ALGORITHM)
     return encoded_jwt
 
+@lru_cache(maxsize=4096)
+def _decode_token_cached(token: str) -> Dict[str, Any]:
+    """
+    解码并校验JWT签名，按令牌字符串缓存结果
+    
+    同一令牌在有效期内会被反复使用，签名校验只需做一次；
+    缓存命中时过期时间由调用方自行检查，解码失败抛出的异常不会被缓存
+    """
+    return jwt.decode(token, _SECRET_KEY_BYTES, algorithms=_ALGORITHMS)
+
+def _decode_token(token: str) -> Dict[str, Any]:
+    """解码JWT令牌，缓存命中时手动检查exp，返回payload的副本避免调用方修改缓存"""
+    payload = _decode_token_cached(token)
+    exp = payload.get("exp")
+    if exp is not None and exp <= time.time():
+        raise JWTError("Signature has expired.")
+    return dict(payload)
+
 def verify_token(token: str) -> Dict[str, Any]:
     """
     验证JWT令牌
@@ -81,7 +108,7 @@ def verify_token(token: str) -> Dict[str, Any]:
     )
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_token(token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
@@ -115,12 +142,12 @@ def create_refresh_token(data: Dict[str, Any], expires_delta: Optional[timedelta
     """
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = int(time.time() + expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(days=7)  # 刷新令牌7天有效
+        expire = int(time.time()) + 7 * 24 * 60 * 60  # 刷新令牌7天有效
     
     to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY_BYTES, algorithm=ALGORITHM)
     return encoded_jwt
 
 def verify_refresh_token(token: str) -> Dict[str, Any]:
@@ -143,7 +170,7 @@ def verify_refresh_token(token: str) -> Dict[str, Any]:
     )
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_token(token)
         token_type: str = payload.get("type")
         username: str = payload.get("sub")
         
@@ -187,8 +214,11 @@ def hash_api_key(api_key: str) -> str:
     
     Returns:
         哈希后的API密钥
+    
+    API密钥由 secrets.token_urlsafe(32) 生成，本身熵足够高，不需要bcrypt这类慢哈希，
+    使用以 SECRET_KEY 为密钥的 HMAC-SHA256 即可
     """
-    return get_password_hash(api_key)
+    return hmac.new(_SECRET_KEY_BYTES, api_key.encode(), hashlib.sha256).hexdigest()
 
 def verify_api_key(api_key: str, hashed_api_key: str) -> bool:
     """
@@ -201,5 +231,5 @@ def verify_api_key(api_key: str, hashed_api_key: str) -> bool:
     Returns:
         验证结果
     """
-    return verify_password(api_key, hashed_api_key)
+    return hmac.compare_digest(hash_api_key(api_key), hashed_api_key)
 
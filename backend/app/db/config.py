@@ -3,8 +3,9 @@
 允许用户选择不同的数据库文件
 """
 import os
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 class DatabaseConfig:
     """数据库配置管理类"""
@@ -23,9 +24,19 @@ class DatabaseConfig:
         }
     }
     
+    # 数据库文件状态缓存的有效期（秒），文件大小在进程运行期间很少变化
+    STAT_CACHE_TTL_SECONDS = 30
+    
     def __init__(self):
-        self.project_root = Path(__file__).parent.parent.parent.parent
+        self.project_root = Path(__file__).resolve().parents[3]
+        # 可用数据库集合固定，文件路径在初始化时一次性算好
+        self._resolved_paths = {
+            name: self.project_root / info["path"]
+            for name, info in self.AVAILABLE_DATABASES.items()
+        }
         self._current_db = None
+        # 数据库文件路径 -> (过期时间, 是否存在, 文件大小)
+        self._stat_cache = {}
         self._load_config()
     
     def _load_config(self):
@@ -61,8 +72,7 @@ class DatabaseConfig:
         if db_name not in self.AVAILABLE_DATABASES:
             raise ValueError(f"未知的数据库: {db_name}")
         
-        db_path = self.project_root / self.AVAILABLE_DATABASES[db_name]["path"]
-        return db_path
+        return self._resolved_paths[db_name]
     
     def get_database_info(self, db_name: Optional[str] = None) -> dict:
         """获取数据库信息"""
@@ -76,16 +86,33 @@ class DatabaseConfig:
         db_path = self.get_database_path(db_name)
         
         # 检查文件是否存在
-        if db_path.exists():
-            info["exists"] = True
-            info["file_size_mb"] = round(db_path.stat().st_size / (1024 * 1024), 2)
-        else:
-            info["exists"] = False
-            info["file_size_mb"] = 0
+        exists, file_size = self._stat_database_file(db_path)
+        info["exists"] = exists
+        info["file_size_mb"] = round(file_size / (1024 * 1024), 2) if exists else 0
         
         info["full_path"] = str(db_path)
         return info
     
+    def _stat_database_file(self, db_path: Path) -> Tuple[bool, int]:
+        """
+        获取数据库文件是否存在及其大小，结果按TTL缓存
+        
+        只调用一次stat()，文件不存在时捕获异常，而不是先exists()再stat()
+        """
+        key = str(db_path)
+        now = time.monotonic()
+        cached = self._stat_cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1], cached[2]
+        
+        try:
+            exists, file_size = True, db_path.stat().st_size
+        except OSError:
+            exists, file_size = False, 0
+        
+        self._stat_cache[key] = (now + self.STAT_CACHE_TTL_SECONDS, exists, file_size)
+        return exists, file_size
+    
     def switch_database(self, db_name: str) -> bool:
         """切换数据库"""
         if db_name not in self.AVAILABLE_DATABASES:
@@ -96,14 +123,20 @@ class DatabaseConfig:
         if not db_path.exists():
             return False
         
+        # 已是当前数据库，无需重写配置文件
+        if db_name == self._current_db:
+            return True
+        
         # 更新配置
         self._current_db = db_name
+        self._stat_cache.clear()
         
-        # 保存到配置文件
+        # 保存到配置文件：先写临时文件再原子替换，避免写入中途失败损坏配置
         config_file = self.project_root / ".database_config"
+        tmp_file = config_file.with_name(config_file.name + ".tmp")
         try:
-            with open(config_file, 'w', encoding='utf-8') as f:
-                f.write(db_name)
+            tmp_file.write_text(db_name, encoding='utf-8')
+            os.replace(tmp_file, config_file)
             return True
         except Exception:
             return False
@@ -122,14 +155,12 @@ class DatabaseConfig:
         # 优先选择有用户表的数据库
         for db_name, info in self.AVAILABLE_DATABASES.items():
             if info["has_user_tables"]:
-                db_path = self.get_database_path(db_name)
-                if db_path.exists():
+                if self._stat_database_file(self.get_database_path(db_name))[0]:
                     return db_name
         
         # 如果没有有用户表的数据库，选择第一个存在的
         for db_name, info in self.AVAILABLE_DATABASES.items():
-            db_path = self.get_database_path(db_name)
-            if db_path.exists():
+            if self._stat_database_file(self.get_database_path(db_name))[0]:
                 return db_name
         
         return "openalex_v3"  # 默认
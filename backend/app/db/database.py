@@ -3,421 +3,970 @@
 自动检测并创建缺失的表和索引
 """
 import sqlite3
+import threading
 import aiosqlite
 import json
 import os
+import re
 import uuid
-from typing import Dict, List, Any, Optional
+import time
+from collections import Counter, OrderedDict, deque
+from functools import lru_cache
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
 import logging
 
+# JSON列的解析/序列化优先使用orjson（可选依赖，比标准库json快数倍），未安装时使用标准库json
+try:
+    import orjson
+    
+    _json_loads = orjson.loads
+    
+    def _json_dumps(value: Any) -> str:
+        return orjson.dumps(value).decode("utf-8")
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # 数据库文件路径（通过配置文件管理）
 from .config import db_config
+from .database_manager import DatabaseManager
 DB_PATH = db_config.get_database_path()
 
+# 论文查询的列（RealDatabase._format_paper_data 按这些列在结果中的位置读取），所有完整论文查询共用。
+# 只列出 _PAPER_FIELD_EXPRESSIONS 用到的列：author_orcids、author_institutions、author_countries、
+# cited_by（引用数，与citation_count重复）、crawl_timestamp 没有调用方读取，不再查询
+_PAPER_COLUMNS = (
+    "id, short_id, title, authors, author_names, year, journal, abstract, keywords, doi, "
+    "citation_count, download_count, url, reference_ids, research_field, funding, "
+    "journal_issn, host_organization_name, fwci, citation_percentile, publication_date, "
+    "primary_topic, topics, keywords_display, domain"
+)
+_PAPER_COLUMN_NAMES = tuple(column.strip() for column in _PAPER_COLUMNS.split(","))
+
+# 论文列表展示用到的列（RealDatabase._format_paper_summary 按列名读取），
+# 不读取摘要、引用列表、作者机构等大字段
+_PAPER_SUMMARY_COLUMNS = (
+    "id, short_id, title, author_names, year, journal, citation_count, research_field, primary_topic, domain"
+)
+
+# 高频查询的SQL文本定义为常量：sqlite3按SQL文本缓存预编译语句，
+# 每次使用完全相同的字符串，连接池中的连接就能复用已编译的语句
+SQL_GET_PAPERS = f"SELECT {_PAPER_COLUMNS} FROM works ORDER BY citation_count DESC LIMIT ? OFFSET ?"
+# 论文列表直接在SQLite中拼成JSON：author_names列原样嵌入，不经过Python解析再序列化，
+# 字段顺序和默认值与 PaperSummary / _format_paper_summary 一致
+SQL_GET_PAPER_SUMMARIES_JSON = (
+    "SELECT json_object("
+    "'id', COALESCE(id, ''), 'short_id', short_id, 'title', COALESCE(title, ''), "
+    "'author_names', CASE WHEN json_valid(author_names) THEN json(author_names) ELSE json('[]') END, "
+    "'year', COALESCE(year, 0), 'journal', COALESCE(journal, ''), 'citation_count', COALESCE(citation_count, 0), "
+    "'truth_value_score', NULL, 'research_field', COALESCE(research_field, '')"
+    ") FROM works ORDER BY citation_count DESC LIMIT ? OFFSET ?"
+)
+SQL_GET_PAPER_BY_ID = f"SELECT {_PAPER_COLUMNS} FROM works WHERE id = ?"
+SQL_GET_PAPER_BY_SHORT_ID = f"SELECT {_PAPER_COLUMNS} FROM works WHERE short_id = ?"
+# 搜索查询以w为works表别名，全文索引和LIKE两条路径共用同一列清单和筛选条件
+_PAPER_COLUMNS_W = ", ".join("w." + column for column in _PAPER_COLUMN_NAMES)
+SQL_SEARCH_PAPERS = f"SELECT {_PAPER_COLUMNS_W} FROM {{source}} WHERE {{where}} ORDER BY w.citation_count DESC LIMIT 100"
+SQL_SEARCH_SOURCE_LIKE = "works w"
+# works_fts以works的隐式rowid关联；VACUUM可能重新编号隐式rowid，执行VACUUM后须重建全文索引，
+# 否则匹配结果会关联到错误的论文（见 DatabaseManager._create_search_index）
+SQL_SEARCH_SOURCE_FTS = "works_fts JOIN works w ON w.rowid = works_fts.rowid"
+SQL_SEARCH_CONDITION_FTS = "works_fts MATCH ?"
+# 把搜索词切分为FTS5词元的正则，模块加载时编译一次
+_FTS_TOKEN_RE = re.compile(r"\w+")
+# 整个查询是OpenAlex短ID（如W2963095307）或DOI（可带https://doi.org/或doi:前缀）时直接按标识符查找
+_SHORT_ID_RE = re.compile(r"W\d+", re.IGNORECASE)
+_DOI_RE = re.compile(r"(?:https?://(?:dx\.)?doi\.org/|doi:)?(10\.\S+/\S+)", re.IGNORECASE)
+# 爬虫保存的DOI带https://doi.org/前缀，两种写法都按NOCASE索引等值查找
+SQL_SEARCH_CONDITION_SHORT_ID = "w.short_id = ?"
+SQL_SEARCH_CONDITION_DOI = "w.doi COLLATE NOCASE IN (?, ?)"
+# SQLite的LIKE对ASCII字符本身不区分大小写，无需对列逐行调用LOWER()；
+# 非ASCII字符LOWER()同样不转换，去掉后匹配结果不变
+SQL_SEARCH_CONDITION_LIKE = "(w.title LIKE ?1 OR w.abstract LIKE ?1 OR w.keywords LIKE ?1 OR w.author_names LIKE ?1)"
+# 按作者查询走work_authors表：与原先对author_names的LIKE '%姓名%'一样按子串匹配（不区分大小写），
+# 但只扫描(author_name, work_id)覆盖索引，不读取works表的整行；命中后再按id取works中的行
+SQL_GET_PAPERS_BY_AUTHOR = (
+    f"SELECT {_PAPER_SUMMARY_COLUMNS} FROM works "
+    "WHERE id IN (SELECT work_id FROM work_authors WHERE author_name LIKE ?) "
+    "ORDER BY citation_count DESC LIMIT ?"
+)
+# 作者统计只读取聚合需要的列，按引用数降序以便边读边计算h-index
+SQL_GET_AUTHOR_STATS_ROWS = (
+    "SELECT id, citation_count, research_field, author_institutions FROM works "
+    "WHERE id IN (SELECT work_id FROM work_authors WHERE author_name LIKE ?) "
+    "ORDER BY citation_count DESC LIMIT 1000"
+)
+# ID列表以JSON数组绑定，SQL文本固定，不随列表长度变化；按主键查找，不依赖可能被VACUUM重新编号的隐式rowid
+SQL_GET_PAPERS_BY_WORK_IDS = (
+    f"SELECT {_PAPER_COLUMNS} FROM works WHERE id IN (SELECT value FROM json_each(?))"
+)
+# 数据库统计信息（get_database_stats）
+SQL_COUNT_WORKS = "SELECT COUNT(*) FROM works"
+SQL_WORKS_YEAR_DISTRIBUTION = (
+    "SELECT year, COUNT(*) FROM works WHERE year IS NOT NULL "
+    "GROUP BY year ORDER BY year DESC LIMIT 10"
+)
+# 用户查询的列（UserManager._format_user_data 按列名读取）；显式列出，不读取不需要的列
+_USER_COLUMNS = (
+    "id, username, email, password_hash, full_name, affiliation, research_interests, "
+    "created_at, last_login, updated_at"
+)
+# 收藏夹查询的列（UserManager._format_folder_data 按列名读取）
+_FOLDER_COLUMNS = "uf.id, uf.user_id, uf.name, uf.description, uf.created_at, uf.updated_at"
+
+# 表示“没有值”的JSON文本：这些列在模型中都是列表，"{}"、"null"解析出的空字典/None同样按空列表处理
+_EMPTY_JSON_VALUES = frozenset(("[]", "{}", "null"))
+
+def _safe_json_loads(value, default=None):
+    """
+    解析JSON字段，值为空或解析失败时返回默认值
+    
+    空值可能存为NULL、空串或 _EMPTY_JSON_VALUES 中的文本，都直接返回默认值，不进入JSON解析
+    """
+    if not value or value in _EMPTY_JSON_VALUES:
+        return default or []
+    try:
+        return _json_loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return default or []
+
+def _extract_author_ids(authors_raw) -> List[str]:
+    """authors列解析结果中，作者对象取author_id，字符串原样保留"""
+    authors = []
+    if authors_raw:
+        for author in authors_raw:
+            if isinstance(author, dict) and 'author_id' in author:
+                authors.append(author['author_id'])
+            elif isinstance(author, str):
+                authors.append(author)
+    return authors
+
+# 格式化后的论文字段及取值表达式，{列名} 在生成格式化函数时替换为该列在查询结果中的位置
+_PAPER_FIELD_EXPRESSIONS = (
+    ("id", 'row[{id}] or ""'),
+    ("short_id", "row[{short_id}]"),
+    ("title", 'row[{title}] or ""'),
+    ("authors", "_extract_author_ids(_safe_json_loads(row[{authors}]))"),
+    ("author_names", "_safe_json_loads(row[{author_names}])"),
+    ("year", "row[{year}] or 0"),
+    ("journal", 'row[{journal}] or ""'),
+    ("journal_impact_factor", "None"),  # 这个字段在数据库中不存在
+    ("abstract", 'row[{abstract}] or ""'),
+    ("keywords", "_safe_json_loads(row[{keywords}])"),
+    ("doi", 'row[{doi}] or ""'),
+    ("citation_count", "row[{citation_count}] or 0"),
+    ("download_count", "row[{download_count}] or 0"),
+    ("created_at", 'row[{publication_date}] or ""'),  # 使用publication_date
+    ("url", 'row[{url}] or ""'),
+    ("references", "_safe_json_loads(row[{reference_ids}])"),
+    ("cited_by", "[]"),  # cited_by在数据库中是INTEGER，不是列表
+    ("research_field", 'row[{research_field}] or ""'),
+    ("funding", "_safe_json_loads(row[{funding}])"),
+    ("journal_issn", "row[{journal_issn}]"),
+    ("host_organization", "row[{host_organization_name}]"),
+    ("fwci", "row[{fwci}]"),
+    ("citation_percentile", "row[{citation_percentile}]"),
+    ("publication_date", "row[{publication_date}]"),
+    ("primary_topic", "row[{primary_topic}]"),
+    # 爬虫存储的是主题名称列表，只有论文详情接口用到，由Paper模型在响应时转换为字典列表
+    ("topics", "_safe_json_loads(row[{topics}])"),
+    ("keywords_display", "row[{keywords_display}]"),
+    ("domain", "row[{domain}]"),
+    ("truth_value_score", "None"),
+)
+
+@lru_cache(maxsize=None)
+def _make_paper_formatter(columns: Tuple[str, ...]) -> Callable[[Any], Dict[str, Any]]:
+    """
+    按查询结果的列顺序生成论文格式化函数
+    
+    生成的函数按位置读取各列，直接返回一个字典字面量：aiosqlite.Row按列名取值需要逐个比较列名，
+    每行30多次按名取值是格式化的主要开销，按位置取值约快一倍。同一列清单只生成一次
+    """
+    positions = {column: index for index, column in enumerate(columns)}
+    fields = "".join(
+        f"        {key!r}: {expression.format(**positions)},\n" for key, expression in _PAPER_FIELD_EXPRESSIONS
+    )
+    source = f"def format_paper_data(row):\n    return {{\n{fields}    }}\n"
+    namespace = {"_safe_json_loads": _safe_json_loads, "_extract_author_ids": _extract_author_ids}
+    exec(source, namespace)
+    return namespace["format_paper_data"]
+
 class DatabaseConnection:
     """数据库连接管理类"""
     
+    # 连接池中的连接数量上限，连接都在使用中时新的请求等待空闲连接
+    POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+    
+    # 每个连接缓存的预编译语句数量（sqlite3默认为128）
+    STATEMENT_CACHE_SIZE = 256
+    
+    # 新建连接时执行的PRAGMA，与初始化数据库时使用的连接保持一致
+    CONNECTION_PRAGMAS = DatabaseManager.CONNECTION_PRAGMAS
+    
+    # 后台执行PRAGMA optimize的间隔（秒）：长期运行的服务中数据分布会随爬虫写入变化，
+    # 定期让SQLite按需更新查询规划器的统计信息
+    OPTIMIZE_INTERVAL_SECONDS = 3 * 60 * 60
+    
     def __init__(self):
         self.db_path = str(DB_PATH)
         self._initialized = False
+        # 保证同步/异步调用方并发触发初始化时只执行一次
+        self._init_lock = threading.Lock()
+        # 空闲连接栈：后进先出，优先复用最近用过、页缓存较热的连接
+        self._idle_connections: List[aiosqlite.Connection] = []
+        # 已打开的连接数（空闲 + 使用中），以及限制同时使用的连接数的信号量
+        self._connection_count = 0
+        self._slots = asyncio.Semaphore(self.POOL_SIZE)
+        self._optimizer: asyncio.Task | None = None
         if not os.path.exists(self.db_path):
             raise FileNotFoundError(f"数据库文件不存在: {self.db_path}")
     
     async def get_connection(self):
-        """获取异步数据库连接 - 每次都创建新连接"""
+        """获取异步数据库连接 - 每次都创建新连接，由调用方负责关闭"""
         # 确保数据库已初始化
         if not self._initialized:
             await self._ensure_initialized()
-        return await aiosqlite.connect(self.db_path)
+        db = await aiosqlite.connect(self.db_path, cached_statements=self.STATEMENT_CACHE_SIZE)
+        # 查询结果按列名访问，格式化函数不依赖SELECT中列的顺序
+        db.row_factory = aiosqlite.Row
+        # PRAGMA在连接的整个生命周期内有效，连接池复用连接时无需重复设置
+        for pragma in self.CONNECTION_PRAGMAS:
+            await db.execute(pragma)
+        return db
+    
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        从连接池获取异步数据库连接，退出时归还
+        
+        同时使用的连接数不超过POOL_SIZE，连接都在使用中时等待其他使用者归还；
+        没有空闲连接且未达到上限时新建连接。归还前回滚未提交的事务，保证下一个使用者拿到干净的连接。
+        持有连接期间不要再次调用acquire，否则并发较高时可能互相等待
+        """
+        async with self._slots:
+            if self._idle_connections:
+                db = self._idle_connections.pop()
+            else:
+                db = await self._open_connection()
+            
+            try:
+                yield db
+            finally:
+                await self._release(db)
+    
+    async def _open_connection(self) -> aiosqlite.Connection:
+        """新建连接池中的连接并计数"""
+        db = await self.get_connection()
+        self._connection_count += 1
+        return db
+    
+    async def _close_connection(self, db: aiosqlite.Connection):
+        """关闭连接池中的连接并计数"""
+        self._connection_count -= 1
+        await db.close()
+    
+    async def _release(self, db: aiosqlite.Connection):
+        """归还连接到连接池"""
+        try:
+            if db.in_transaction:
+                await db.rollback()
+            self._idle_connections.append(db)
+            return
+        except Exception as e:
+            logger.warning(f"数据库连接无法复用，将被关闭: {str(e)}")
+        await self._close_connection(db)
+    
+    async def warm_up(self):
+        """预先打开连接池中的连接（应用启动时调用），首个请求无需等待初始化数据库和建立连接"""
+        while self._connection_count < self.POOL_SIZE:
+            self._idle_connections.append(await self._open_connection())
+    
+    async def optimize(self):
+        """执行PRAGMA optimize，由SQLite判断哪些表的统计信息需要更新（ANALYZE）"""
+        try:
+            async with self.acquire() as db:
+                await db.execute("PRAGMA optimize")
+        except Exception as e:
+            logger.warning(f"优化数据库统计信息失败: {str(e)}")
+    
+    async def _run_optimizer(self):
+        """后台定期执行PRAGMA optimize"""
+        while True:
+            await asyncio.sleep(self.OPTIMIZE_INTERVAL_SECONDS)
+            await self.optimize()
+    
+    def start_optimizer(self):
+        """启动后台统计信息优化任务（应用启动时调用）"""
+        if self._optimizer is None or self._optimizer.done():
+            self._optimizer = asyncio.create_task(self._run_optimizer())
+    
+    async def stop_optimizer(self):
+        """停止后台统计信息优化任务"""
+        if self._optimizer is not None:
+            self._optimizer.cancel()
+            try:
+                await self._optimizer
+            except asyncio.CancelledError:
+                pass
+            self._optimizer = None
+    
+    async def close(self):
+        """
+        关闭连接池中的所有空闲连接
+        
+        关闭前执行PRAGMA optimize：SQLite会根据该连接执行过的查询判断需要更新统计信息的表
+        """
+        while self._idle_connections:
+            db = self._idle_connections.pop()
+            try:
+                await db.execute("PRAGMA optimize")
+            except Exception as e:
+                logger.warning(f"优化数据库统计信息失败: {str(e)}")
+            await self._close_connection(db)
     
     def get_sync_connection(self):
         """获取同步数据库连接"""
         # 确保数据库已初始化
         if not self._initialized:
-            # 对于同步连接，我们需要在另一个线程中运行初始化
-            import threading
-            import asyncio
-            
-            def run_init():
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    loop.run_until_complete(self._ensure_initialized())
-                finally:
-                    loop.close()
-            
-            thread = threading.Thread(target=run_init)
-            thread.start()
-            thread.join()
+            self._initialize_sync()
         
         return sqlite3.connect(self.db_path)
     
     async def _ensure_initialized(self):
-        """确保数据库已初始化"""
+        """确保数据库已初始化（初始化只涉及sqlite3同步操作，放到线程池中执行）"""
         if self._initialized:
             return
-        
-        try:
-            # 导入数据库管理器
-            from .database_manager import DatabaseManager
-            
-            # 创建数据库管理器并初始化
-            db_manager = DatabaseManager(self.db_path)
-            success = await db_manager.initialize_database()
+        await asyncio.to_thread(self._initialize_sync)
+    
+    def _initialize_sync(self):
+        """同步初始化数据库，加锁避免重复初始化"""
+        with self._init_lock:
+            if self._initialized:
+                return
             
-            if success:
-                logger.info("数据库自动初始化成功")
-                self._initialized = True
-            else:
-                logger.error("数据库自动初始化失败")
-                # 即使初始化失败，也继续运行，但记录错误
+            try:
+                # 创建数据库管理器并初始化
+                db_manager = DatabaseManager(self.db_path)
+                success = db_manager.initialize_database_sync()
                 
-        except Exception as e:
-            logger.error(f"数据库初始化过程中发生错误: {str(e)}")
-            # 即使初始化失败，也继续运行，但记录错误
+                if success:
+                    logger.info("数据库自动初始化成功")
+                    self._initialized = True
+                else:
+                    logger.error("数据库自动初始化失败")
+                    # 即使初始化失败，也继续运行，但记录错误
+                    
+            except Exception as e:
+                logger.error(f"数据库初始化过程中发生错误: {str(e)}")
+                # 即使初始化失败，也继续运行，但记录错误
 
 class RealDatabase:
     """真实数据库操作类"""
     
-    def __init__(self):
-        self.connection = DatabaseConnection()
+    # 大结果集按块读取时每次fetchmany的行数
+    FETCH_CHUNK_SIZE = 256
+    # 作者信息中返回的论文数量
+    AUTHOR_TOP_PAPERS = 10
+    # 作者信息中返回的机构、研究领域数量
+    AUTHOR_AFFILIATIONS = 3
+    AUTHOR_RESEARCH_AREAS = 5
+    # 全表聚合统计的缓存时间（秒）：论文数据只由爬虫批量写入，短时间内不会变化
+    DATABASE_STATS_CACHE_TTL_SECONDS = 60
+    RESEARCH_FIELDS_STATS_CACHE_TTL_SECONDS = 300
+    # 论文详情LRU缓存的最大条数（每条为格式化后的论文字典，约几KB）
+    PAPER_CACHE_SIZE = 8192
+    # 论文详情缓存时间（秒）：爬虫会原地更新已有论文（引用数、摘要等），过期后重新查询
+    PAPER_CACHE_TTL_SECONDS = 300
     
-    def _format_paper_data(self, row) -> Dict[str, Any]:
-        """格式化论文数据"""
-        if not row:
-            return None
+    def __init__(self, connection: DatabaseConnection | None = None):
+        self.connection = connection or DatabaseConnection()
+        # works_fts 全文索引是否可用，首次搜索时检测
+        self._fts_available = None
+        # 统计结果缓存：方法名 -> (过期时间, 统计结果)
+        self._stats_cache: Dict[str, tuple] = {}
+        # 每个统计项一把锁：缓存过期时并发请求只由一个执行聚合查询，其余等待后直接读缓存
+        self._stats_locks: Dict[str, asyncio.Lock] = {}
+        # 论文详情缓存：论文ID（或short_id）-> (过期时间, 格式化后的论文数据)，按最近使用顺序排列
+        self._paper_cache: OrderedDict[str, tuple] = OrderedDict()
+        # 完整论文数据的格式化函数，按 _PAPER_COLUMNS 的列顺序生成
+        self._format_paper_data = _make_paper_formatter(_PAPER_COLUMN_NAMES)
+    
+    def _get_cached_stats(self, key: str) -> Dict[str, Any] | None:
+        """获取未过期的统计缓存"""
+        cached = self._stats_cache.get(key)
+        if cached and cached[0] > time.time():
+            return cached[1]
+        return None
+    
+    def _stats_lock(self, key: str) -> asyncio.Lock:
+        """获取统计项对应的锁"""
+        lock = self._stats_locks.get(key)
+        if lock is None:
+            lock = self._stats_locks[key] = asyncio.Lock()
+        return lock
+    
+    def _cache_stats(self, key: str, ttl: int, stats: Dict[str, Any]):
+        """缓存统计结果"""
+        self._stats_cache[key] = (time.time() + ttl, stats)
+    
+    def clear_stats_cache(self):
+        """
+        清空统计缓存
         
-        # 解析JSON字段
-        def safe_json_loads(value, default=None):
-            if not value:
-                return default or []
-            try:
-                return json.loads(value)
-            except (json.JSONDecodeError, TypeError):
-                return default or []
+        手动初始化数据库后调用；爬虫在独立进程中写入论文数据，应用无法感知，这部分依靠缓存过期时间刷新
+        """
+        self._stats_cache.clear()
+    
+    def clear_paper_cache(self):
+        """
+        清空论文详情缓存
         
-        def safe_get(row, index, default=None):
-            """安全获取行数据，避免索引越界"""
-            try:
-                return row[index] if row[index] is not None else default
-            except (IndexError, TypeError):
-                return default
-        
-        # 处理authors字段（可能是JSON字符串）
-        authors_raw = safe_json_loads(safe_get(row, 3))
-        authors = []
-        if authors_raw:
-            for author in authors_raw:
-                if isinstance(author, dict) and 'author_id' in author:
-                    authors.append(author['author_id'])
-                elif isinstance(author, str):
-                    authors.append(author)
-        
-        # 处理topics字段，确保返回字典列表
-        topics_raw = safe_json_loads(safe_get(row, 26))  # topics列的正确索引
-        topics = []
-        if topics_raw:
-            for topic in topics_raw:
-                if isinstance(topic, str):
-                    topics.append({"display_name": topic})
-                elif isinstance(topic, dict):
-                    topics.append(topic)
+        手动初始化数据库后调用；爬虫对论文的更新依靠缓存过期时间刷新
+        """
+        self._paper_cache.clear()
+    
+    async def _fetch_formatted(self, db, query: str, params, formatter) -> List[Dict[str, Any]]:
+        """
+        执行查询并按块读取、逐块格式化
         
-        return {
-            "id": safe_get(row, 0, ""),
-            "short_id": safe_get(row, 1),
-            "title": safe_get(row, 2, ""),
-            "authors": authors,
-            "author_names": safe_json_loads(safe_get(row, 4)),
-            "year": safe_get(row, 5, 0),
-            "journal": safe_get(row, 6, ""),
-            "journal_impact_factor": None,  # 这个字段在数据库中不存在
-            "abstract": safe_get(row, 7, ""),
-            "keywords": safe_json_loads(safe_get(row, 8)),
-            "doi": safe_get(row, 9, ""),
-            "citation_count": safe_get(row, 10, 0),
-            "download_count": safe_get(row, 11, 0),
-            "created_at": safe_get(row, 24, ""),  # 使用publication_date
-            "url": safe_get(row, 12, ""),
-            "references": safe_json_loads(safe_get(row, 13)),
-            "cited_by": [],  # cited_by在数据库中是INTEGER，不是列表
-            "research_field": safe_get(row, 15, ""),
-            "funding": safe_json_loads(safe_get(row, 16)),
-            "journal_issn": safe_get(row, 17),
-            "host_organization": safe_get(row, 18),
-            "author_orcids": safe_json_loads(safe_get(row, 19)),
-            "author_institutions": safe_json_loads(safe_get(row, 20)),
-            "author_countries": safe_json_loads(safe_get(row, 21)),
-            "fwci": safe_get(row, 22),
-            "citation_percentile": safe_get(row, 23),
-            "publication_date": safe_get(row, 24),
-            "primary_topic": safe_get(row, 25),
-            "topics": topics,
-            "keywords_display": safe_get(row, 27),
-            "domain": safe_get(row, 28),
-            "truth_value_score": None
-        }
+        每次只持有一块原始行，不会同时保留全部原始行和全部格式化结果；
+        返回行数少于块大小时说明已读完，不再多发一次空的fetchmany
+        """
+        results = []
+        async with db.execute(query, params) as cursor:
+            while True:
+                rows = await cursor.fetchmany(self.FETCH_CHUNK_SIZE)
+                results.extend(formatter(row) for row in rows)
+                if len(rows) < self.FETCH_CHUNK_SIZE:
+                    break
+        return results
     
     async def get_papers(self, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
         """获取论文列表"""
-        db = await self.connection.get_connection()
-        try:
-            query = """
-                SELECT id, short_id, title, authors, author_names, year, journal, abstract, keywords, doi,
-                       citation_count, download_count, url, reference_ids, cited_by, research_field, funding,
-                       journal_issn, host_organization_name, author_orcids, author_institutions, author_countries,
-                       fwci, citation_percentile, publication_date, primary_topic, topics, keywords_display, domain, crawl_timestamp
-                FROM works 
-                ORDER BY citation_count DESC 
-                LIMIT ? OFFSET ?
-            """
-            async with db.execute(query, (limit, offset)) as cursor:
+        async with self.connection.acquire() as db:
+            return await self._fetch_formatted(db, SQL_GET_PAPERS, (limit, offset), self._format_paper_data)
+    
+    async def get_paper_summaries_json(self, limit: int = 10, offset: int = 0) -> str:
+        """
+        获取论文摘要列表，直接返回JSON数组文本
+        
+        每行的JSON由SQLite生成，Python端只负责拼接，避免逐行解析JSON列、构造模型再序列化
+        """
+        async with self.connection.acquire() as db:
+            async with db.execute(SQL_GET_PAPER_SUMMARIES_JSON, (limit, offset)) as cursor:
                 rows = await cursor.fetchall()
-                return [self._format_paper_data(row) for row in rows if row]
-        finally:
-            await db.close()
+        return "[" + ",".join(row[0] for row in rows) + "]"
     
     async def get_paper_by_id(self, paper_id: str) -> Dict[str, Any] | None:
-        """通过ID或short_id获取论文详情"""
-        db = await self.connection.get_connection()
-        try:
-            # 如果是short_id格式（如W2963095307），转换为完整ID查询
-            if paper_id.startswith('W') and len(paper_id) <= 15:
-                query = """
-                    SELECT id, short_id, title, authors, author_names, year, journal, abstract, keywords, doi,
-                           citation_count, download_count, url, reference_ids, cited_by, research_field, funding,
-                           journal_issn, host_organization_name, author_orcids, author_institutions, author_countries,
-                           fwci, citation_percentile, publication_date, primary_topic, topics, keywords_display, domain, crawl_timestamp
-                    FROM works 
-                    WHERE short_id = ?
-                """
-                async with db.execute(query, (paper_id,)) as cursor:
-                    row = await cursor.fetchone()
-                    if row:
-                        return self._format_paper_data(row)
-            else:
-                # 如果是完整ID，直接查询
-                query = """
-                    SELECT id, short_id, title, authors, author_names, year, journal, abstract, keywords, doi,
-                           citation_count, download_count, url, reference_ids, cited_by, research_field, funding,
-                           journal_issn, host_organization_name, author_orcids, author_institutions, author_countries,
-                           fwci, citation_percentile, publication_date, primary_topic, topics, keywords_display, domain, crawl_timestamp
-                    FROM works 
-                    WHERE id = ?
-                """
-                async with db.execute(query, (paper_id,)) as cursor:
-                    row = await cursor.fetchone()
-                    if row:
-                        return self._format_paper_data(row)
+        """
+        通过ID或short_id获取论文详情
+        
+        格式化后的结果按ID缓存在LRU中（最多 PAPER_CACHE_SIZE 条，PAPER_CACHE_TTL_SECONDS 秒后过期），
+        调用方只读取、不修改返回的字典；不存在的论文不缓存
+        """
+        cached = self._paper_cache.get(paper_id)
+        if cached is not None:
+            if cached[0] > time.time():
+                self._paper_cache.move_to_end(paper_id)
+                return cached[1]
+            del self._paper_cache[paper_id]
+        
+        # 如果是short_id格式（如W2963095307）按short_id查询，否则按完整ID查询
+        if paper_id.startswith('W') and len(paper_id) <= 15:
+            query = SQL_GET_PAPER_BY_SHORT_ID
+        else:
+            query = SQL_GET_PAPER_BY_ID
+        
+        async with self.connection.acquire() as db:
+            async with db.execute(query, (paper_id,)) as cursor:
+                row = await cursor.fetchone()
+        if not row:
             return None
-        finally:
-            await db.close()
+        
+        paper = self._format_paper_data(row)
+        self._paper_cache[paper_id] = (time.time() + self.PAPER_CACHE_TTL_SECONDS, paper)
+        if len(self._paper_cache) > self.PAPER_CACHE_SIZE:
+            self._paper_cache.popitem(last=False)
+        return paper
+    
+    async def get_papers_by_ids(self, paper_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        批量获取论文详情，返回以传入ID（完整ID或short_id）为键的字典
+        
+        用一次 IN 查询代替逐个调用 get_paper_by_id，调用方按原ID列表顺序取用即可保持顺序
+        """
+        return await self._fetch_papers_by_ids(paper_ids, _PAPER_COLUMNS, self._format_paper_data)
+    
+    async def get_paper_summaries_by_ids(self, paper_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        批量获取论文摘要信息（只包含 PaperSummary 需要的字段），返回以传入ID为键的字典
+        
+        只查询列表展示用到的几列，不读取摘要、引用列表、作者机构等大字段
+        """
+        return await self._fetch_papers_by_ids(paper_ids, _PAPER_SUMMARY_COLUMNS, self._format_paper_summary)
+    
+    async def _fetch_papers_by_ids(self, paper_ids: List[str], columns: str, formatter) -> Dict[str, Dict[str, Any]]:
+        """按ID批量查询论文，columns 为查询的列，formatter 负责把行转换为字典"""
+        if not paper_ids:
+            return {}
+        
+        # 与 get_paper_by_id 相同的规则区分short_id和完整ID
+        short_ids = list(dict.fromkeys(pid for pid in paper_ids if pid.startswith('W') and len(pid) <= 15))
+        full_ids = list(dict.fromkeys(pid for pid in paper_ids if not (pid.startswith('W') and len(pid) <= 15)))
+        
+        papers = {}
+        async with self.connection.acquire() as db:
+            for column, ids in (("short_id", short_ids), ("id", full_ids)):
+                if not ids:
+                    continue
+                # ID列表整体作为一个JSON参数绑定，SQL文本与ID数量无关，
+                # 同一查询始终命中连接上的预编译语句缓存，也不受参数数量上限限制
+                query = f"SELECT {columns} FROM works WHERE {column} IN (SELECT value FROM json_each(?))"
+                async with db.execute(query, (_json_dumps(ids),)) as cursor:
+                    rows = await cursor.fetchall()
+                    for row in rows:
+                        paper = formatter(row)
+                        papers[paper[column]] = paper
+            return papers
+    
+    def _format_paper_summary(self, row) -> Dict[str, Any]:
+        """格式化按 _PAPER_SUMMARY_COLUMNS 查询的论文摘要数据"""
+        return {
+            "id": row["id"] or "",
+            "short_id": row["short_id"],
+            "title": row["title"] or "",
+            "author_names": _safe_json_loads(row["author_names"]),
+            "year": row["year"] or 0,
+            "journal": row["journal"] or "",
+            "citation_count": row["citation_count"] or 0,
+            "research_field": row["research_field"] or "",
+            "primary_topic": row["primary_topic"],
+            "domain": row["domain"],
+            "truth_value_score": None
+        }
     
     async def search_papers(self, query: str, filters: Dict = None) -> List[Dict[str, Any]]:
-        """搜索论文"""
-        db = await self.connection.get_connection()
-        try:
-            search_query = f"%{query.lower()}%"
+        """
+        搜索论文
+        
+        优先使用 works_fts 全文索引匹配标题、摘要、关键词和作者（每个词按前缀匹配）；
+        全文索引不可用、查询为空或包含中文等unicode61分词器无法切分的文字时，回退到LIKE查询。
+        filters 为 SearchFilters 的字段：year_min、year_max、journals、research_fields、authors、
+        keywords、institutions、min_citations、min_truth_value
+        """
+        if filters and filters.get("min_truth_value"):
+            # works表中没有真值分数（论文的truth_value_score均为None），没有论文能满足最低真值分数
+            return []
+        
+        match_query = self._build_fts_query(query)
+        filter_conditions, filter_params = self._build_filter_conditions(filters)
+        
+        async with self.connection.acquire() as db:
+            identifier = self._build_identifier_condition(query)
+            if identifier:
+                # 按短ID/DOI走索引等值查找，命中时无需全文检索；未命中再按普通查询搜索
+                condition, params = identifier
+                sql = SQL_SEARCH_PAPERS.format(
+                    source=SQL_SEARCH_SOURCE_LIKE, where=" AND ".join([condition] + filter_conditions)
+                )
+                papers = await self._fetch_formatted(db, sql, params + filter_params, self._format_paper_data)
+                if papers:
+                    return papers
             
-            sql = """
-                SELECT id, short_id, title, authors, author_names, year, journal, abstract, keywords, doi,
-                       citation_count, download_count, url, reference_ids, cited_by, research_field, funding,
-                       journal_issn, host_organization_name, author_orcids, author_institutions, author_countries,
-                       fwci, citation_percentile, publication_date, primary_topic, topics, keywords_display, domain, crawl_timestamp
-                FROM works 
-                WHERE LOWER(title) LIKE ? OR LOWER(abstract) LIKE ?
-                ORDER BY citation_count DESC
-                LIMIT 100
-            """
+            if match_query and await self._has_fts_index(db):
+                source = SQL_SEARCH_SOURCE_FTS
+                conditions, params = [SQL_SEARCH_CONDITION_FTS], [match_query]
+            elif query:
+                source = SQL_SEARCH_SOURCE_LIKE
+                conditions, params = [SQL_SEARCH_CONDITION_LIKE], [f"%{query.lower()}%"]
+            else:
+                # 查询为空时只按筛选条件查询，筛选列上的索引可以直接使用
+                source = SQL_SEARCH_SOURCE_LIKE
+                conditions, params = [], []
             
-            async with db.execute(sql, (search_query, search_query)) as cursor:
-                rows = await cursor.fetchall()
-                return [self._format_paper_data(row) for row in rows if row]
-        finally:
-            await db.close()
+            where = " AND ".join(conditions + filter_conditions) or "1"
+            sql = SQL_SEARCH_PAPERS.format(source=source, where=where)
+            return await self._fetch_formatted(db, sql, params + filter_params, self._format_paper_data)
     
-    async def get_papers_by_author(self, author_name: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """根据作者姓名获取论文"""
-        db = await self.connection.get_connection()
-        try:
-            search_pattern = f"%{author_name.lower()}%"
-            query = """
-                SELECT id, short_id, title, authors, author_names, year, journal, abstract, keywords, doi,
-                       citation_count, download_count, url, reference_ids, cited_by, research_field, funding,
-                       journal_issn, host_organization_name, author_orcids, author_institutions, author_countries,
-                       fwci, citation_percentile, publication_date, primary_topic, topics, keywords_display, domain, crawl_timestamp
-                FROM works 
-                WHERE LOWER(author_names) LIKE ?
-                ORDER BY citation_count DESC 
-                LIMIT ?
-            """
-            async with db.execute(query, (search_pattern, limit)) as cursor:
-                rows = await cursor.fetchall()
-                return [self._format_paper_data(row) for row in rows if row]
-        finally:
-            await db.close()
+    @staticmethod
+    def _build_filter_conditions(filters: Dict | None) -> tuple[List[str], List[Any]]:
+        """
+        将搜索筛选条件（SearchFilters的字段）转换为SQL条件和参数
+        
+        列表类条件以JSON数组绑定为一个参数（IN (SELECT value FROM json_each(?))），SQL文本不随列表长度变化。
+        期刊名、作者姓名、关键词和机构不区分大小写（后三者分别通过work_authors、work_keywords、work_institutions表匹配），
+        研究领域按/search/filters给出的取值精确匹配
+        """
+        conditions, params = [], []
+        if not filters:
+            return conditions, params
+        
+        if filters.get("year_min") is not None:
+            conditions.append("w.year >= ?")
+            params.append(filters["year_min"])
+        if filters.get("year_max") is not None:
+            conditions.append("w.year <= ?")
+            params.append(filters["year_max"])
+        if filters.get("journals"):
+            conditions.append("w.journal COLLATE NOCASE IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(filters["journals"]))
+        if filters.get("research_fields"):
+            conditions.append("w.research_field IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(filters["research_fields"]))
+        if filters.get("authors"):
+            conditions.append(
+                "w.id IN (SELECT work_id FROM work_authors WHERE author_name IN (SELECT value FROM json_each(?)))"
+            )
+            params.append(json.dumps(filters["authors"]))
+        if filters.get("keywords"):
+            conditions.append(
+                "w.id IN (SELECT work_id FROM work_keywords WHERE keyword IN (SELECT value FROM json_each(?)))"
+            )
+            params.append(json.dumps(filters["keywords"]))
+        if filters.get("institutions"):
+            conditions.append(
+                "w.id IN (SELECT work_id FROM work_institutions WHERE institution IN (SELECT value FROM json_each(?)))"
+            )
+            params.append(json.dumps(filters["institutions"]))
+        if filters.get("min_citations") is not None:
+            conditions.append("w.citation_count >= ?")
+            params.append(filters["min_citations"])
+        return conditions, params
     
-    async def get_author_info(self, author_name: str) -> Dict[str, Any] | None:
-        """获取作者信息（通过聚合论文数据计算）"""
-        papers = await self.get_papers_by_author(author_name, limit=1000)
+    @staticmethod
+    def _build_identifier_condition(query: str) -> tuple[str, List[str]] | None:
+        """查询整体是短ID或DOI时，返回按该标识符查找的SQL条件和参数，否则返回None"""
+        query = (query or "").strip()
+        if _SHORT_ID_RE.fullmatch(query):
+            return SQL_SEARCH_CONDITION_SHORT_ID, [query.upper()]
+        doi_match = _DOI_RE.fullmatch(query)
+        if doi_match:
+            doi = doi_match.group(1)
+            return SQL_SEARCH_CONDITION_DOI, [doi, f"https://doi.org/{doi}"]
+        return None
+    
+    @staticmethod
+    def _build_fts_query(query: str) -> str | None:
+        """
+        将用户输入转换为FTS5 MATCH表达式：按词切分，每个词加引号并做前缀匹配，词之间为AND关系
         
-        if not papers:
+        unicode61分词器不能切分中文，这类查询返回None，由调用方回退到LIKE查询
+        """
+        if not query or not query.isascii():
+            return None
+        tokens = _FTS_TOKEN_RE.findall(query.lower())
+        if not tokens:
             return None
+        return " ".join(f'"{token}"*' for token in tokens)
+    
+    async def _has_fts_index(self, db) -> bool:
+        """检查 works_fts 全文索引是否存在，结果只查询一次"""
+        if self._fts_available is None:
+            async with db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'works_fts'"
+            ) as cursor:
+                self._fts_available = await cursor.fetchone() is not None
+        return self._fts_available
+    
+    async def get_papers_by_author(self, author_name: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        根据作者姓名获取论文（姓名按子串匹配，不区分大小写）
         
-        # 计算统计信息
-        total_citations = sum(paper.get("citation_count", 0) for paper in papers)
-        total_papers = len(papers)
+        调用方只做列表展示和按年份/引用数统计，因此只查询摘要列，返回 _format_paper_summary 格式
+        """
+        async with self.connection.acquire() as db:
+            search_pattern = f"%{author_name}%"
+            return await self._fetch_formatted(
+                db, SQL_GET_PAPERS_BY_AUTHOR, (search_pattern, limit), self._format_paper_summary
+            )
+    
+    async def get_author_info(self, author_name: str) -> Dict[str, Any] | None:
+        """
+        获取作者信息（通过聚合论文数据计算）
         
-        # 计算h-index
-        citations = sorted([paper.get("citation_count", 0) for paper in papers], reverse=True)
+        通过work_authors表按姓名子串找到作者的论文，只查询一次：统计部分只查询引用数、研究领域和机构三列，按块读取并边读边聚合，
+        不保留最多1000行的结果；同时记下前10篇的ID，再按主键直接取展示用的完整字段。
+        机构和研究领域按引用数从高到低取前几个，凑满后不再解析后续行的机构JSON
+        """
+        search_pattern = f"%{author_name}%"
+        total_papers = 0
+        total_citations = 0
         h_index = 0
-        for i, citation_count in enumerate(citations):
-            if citation_count >= i + 1:
-                h_index = i + 1
-            else:
-                break
+        # 用dict保持插入顺序，即按论文引用数从高到低
+        research_areas = {}
+        affiliations = {}
+        top_ids = []
         
-        # 提取研究领域和机构信息
-        research_areas = set()
-        affiliations = set()
-        
-        for paper in papers:
-            if paper.get("research_field"):
-                research_areas.add(paper["research_field"])
-            institutions = paper.get("author_institutions", [])
-            if institutions:
-                for inst in institutions:
-                    if isinstance(inst, str):
-                        affiliations.add(inst)
+        async with self.connection.acquire() as db:
+            async with db.execute(SQL_GET_AUTHOR_STATS_ROWS, (search_pattern,)) as cursor:
+                while True:
+                    rows = await cursor.fetchmany(self.FETCH_CHUNK_SIZE)
+                    if not rows:
+                        break
+                    for work_id, citation_count, research_field, institutions_raw in rows:
+                        citation_count = citation_count or 0
+                        total_papers += 1
+                        if total_papers <= self.AUTHOR_TOP_PAPERS:
+                            top_ids.append(work_id)
+                        total_citations += citation_count
+                        # 结果按引用数降序排列，第i篇的引用数不小于i时h-index即为i
+                        if citation_count >= total_papers:
+                            h_index = total_papers
+                        
+                        # 提取研究领域和机构信息
+                        if research_field and len(research_areas) < self.AUTHOR_RESEARCH_AREAS:
+                            research_areas[research_field] = None
+                        if not institutions_raw or len(affiliations) >= self.AUTHOR_AFFILIATIONS:
+                            continue
+                        try:
+                            institutions = _json_loads(institutions_raw)
+                        except (json.JSONDecodeError, TypeError):
+                            continue
+                        for inst in institutions or []:
+                            if isinstance(inst, str):
+                                affiliations[inst] = None
+            
+            if not total_papers:
+                return None
+            
+            async with db.execute(SQL_GET_PAPERS_BY_WORK_IDS, (_json_dumps(top_ids),)) as cursor:
+                rows_by_id = {row["id"]: row for row in await cursor.fetchall()}
+            papers = [self._format_paper_data(rows_by_id[work_id]) for work_id in top_ids if work_id in rows_by_id]
         
         return {
             "name": author_name,
-            "affiliation": list(affiliations)[:3] if affiliations else [],
-            "research_areas": list(research_areas)[:5],
+            "affiliation": list(affiliations)[:self.AUTHOR_AFFILIATIONS],
+            "research_areas": list(research_areas),
             "h_index": h_index,
             "citation_count": total_citations,
             "paper_count": total_papers,
-            "papers": papers[:10]  # 返回前10篇论文
+            "papers": papers  # 返回引用数最高的前10篇论文
         }
     
+    async def get_authors_info(self, author_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """批量获取作者信息（并发聚合），返回以作者姓名为键的字典"""
+        unique_names = list(dict.fromkeys(author_names))
+        infos = await asyncio.gather(*(self.get_author_info(name) for name in unique_names))
+        return {name: info for name, info in zip(unique_names, infos) if info}
+    
+    async def _fetch_scalar(self, query: str, params: tuple = ()) -> Any:
+        """从连接池取一个连接执行查询，返回第一行第一列"""
+        async with self.connection.acquire() as db:
+            async with db.execute(query, params) as cursor:
+                row = await cursor.fetchone()
+                return row[0] if row else None
+    
+    async def _fetch_all(self, query: str, params: tuple = ()) -> List[Any]:
+        """从连接池取一个连接执行查询，返回全部行"""
+        async with self.connection.acquire() as db:
+            async with db.execute(query, params) as cursor:
+                return await cursor.fetchall()
+    
     async def get_research_fields_stats(self) -> Dict[str, Any]:
-        """获取研究领域统计"""
-        db = await self.connection.get_connection()
-        try:
-            # 获取前20个最活跃的研究领域
-            query = """
-                SELECT research_field, COUNT(*) as paper_count, SUM(citation_count) as total_citations
-                FROM works 
-                WHERE research_field IS NOT NULL AND research_field != ''
-                GROUP BY research_field 
-                ORDER BY paper_count DESC 
-                LIMIT 20
-            """
-            async with db.execute(query) as cursor:
-                rows = await cursor.fetchall()
-                return {
-                    "field_distribution": {row[0]: {"papers": row[1], "citations": row[2]} for row in rows}
-                }
-        finally:
-            await db.close()
+        """获取研究领域统计（结果缓存 RESEARCH_FIELDS_STATS_CACHE_TTL_SECONDS 秒）"""
+        cached = self._get_cached_stats("research_fields_stats")
+        if cached is not None:
+            return cached
+        
+        async with self._stats_lock("research_fields_stats"):
+            # 等锁期间可能已由其他请求算好
+            cached = self._get_cached_stats("research_fields_stats")
+            if cached is not None:
+                return cached
+            
+            async with self.connection.acquire() as db:
+                # 获取前20个最活跃的研究领域
+                query = """
+                    SELECT research_field, COUNT(*) as paper_count, SUM(citation_count) as total_citations
+                    FROM works 
+                    WHERE research_field IS NOT NULL AND research_field != ''
+                    GROUP BY research_field 
+                    ORDER BY paper_count DESC 
+                    LIMIT 20
+                """
+                async with db.execute(query) as cursor:
+                    rows = await cursor.fetchall()
+            
+            stats = {
+                "field_distribution": {row[0]: {"papers": row[1], "citations": row[2]} for row in rows}
+            }
+            self._cache_stats("research_fields_stats", self.RESEARCH_FIELDS_STATS_CACHE_TTL_SECONDS, stats)
+            return stats
     
     async def get_database_stats(self) -> Dict[str, Any]:
-        """获取数据库统计信息"""
-        db = await self.connection.get_connection()
-        try:
-            # 总论文数
-            total_query = "SELECT COUNT(*) FROM works"
-            async with db.execute(total_query) as cursor:
-                total_papers = (await cursor.fetchone())[0]
+        """获取数据库统计信息（结果缓存 DATABASE_STATS_CACHE_TTL_SECONDS 秒）"""
+        cached = self._get_cached_stats("database_stats")
+        if cached is not None:
+            return cached
+        
+        async with self._stats_lock("database_stats"):
+            # 等锁期间可能已由其他请求算好
+            cached = self._get_cached_stats("database_stats")
+            if cached is not None:
+                return cached
             
-            # 年份分布统计
-            year_query = """
-                SELECT year, COUNT(*) 
-                FROM works 
-                WHERE year IS NOT NULL 
-                GROUP BY year 
-                ORDER BY year DESC 
-                LIMIT 10
-            """
-            async with db.execute(year_query) as cursor:
-                year_stats = await cursor.fetchall()
+            # 两条聚合查询互不依赖，分别从连接池取连接并发执行
+            total_papers, year_stats = await asyncio.gather(
+                self._fetch_scalar(SQL_COUNT_WORKS),
+                self._fetch_all(SQL_WORKS_YEAR_DISTRIBUTION)
+            )
             
-            return {
+            stats = {
                 "total_papers": total_papers,
                 "year_distribution": {str(year): count for year, count in year_stats}
             }
-        finally:
-            await db.close()
+            self._cache_stats("database_stats", self.DATABASE_STATS_CACHE_TTL_SECONDS, stats)
+            return stats
 
 
 class UserManager:
     """用户数据管理（使用SQLite数据库）"""
     
-    def __init__(self):
-        self.connection = DatabaseConnection()
+    # 热门搜索统计的滚动窗口（秒）
+    TRENDING_WINDOW_SECONDS = 24 * 60 * 60
+    # 用户偏好画像缓存有效期（秒）
+    PREFERENCE_PROFILE_TTL_SECONDS = 600
+    # 工作台概览缓存有效期（秒），写操作会提前使其失效
+    DASHBOARD_CACHE_TTL_SECONDS = 300
+    # 每日推荐缓存有效期（秒），缓存键包含日期，跨天自动失效
+    RECOMMENDATION_CACHE_TTL_SECONDS = 3600
+    # 阅读/搜索历史写缓冲：积累到一定条数或超过一定时间后批量写入
+    HISTORY_FLUSH_SIZE = 100
+    HISTORY_FLUSH_INTERVAL_SECONDS = 0.5
+    
+    def __init__(self, connection: DatabaseConnection | None = None):
+        self.connection = connection or DatabaseConnection()
+        # 热门搜索：窗口内的 (时间戳, 查询词) 队列及对应计数，写入搜索历史时增量维护
+        self._trending_window = deque()
+        self._trending_counts = Counter()
+        self._trending_lock = asyncio.Lock()
+        # 用户偏好画像缓存：user_id -> (过期时间, 画像)
+        self._preference_profiles: Dict[str, tuple] = {}
+        # 工作台概览缓存：user_id -> (过期时间, ETag, 响应内容)
+        self._dashboard_cache: Dict[str, tuple] = {}
+        # 每日推荐缓存：user_id -> {(推荐数量, 日期, 是否个性化): (过期时间, 推荐列表)}
+        self._recommendation_cache: Dict[str, Dict[tuple, tuple]] = {}
+        # 待写入的历史记录：(user_id, paper_id/query, 时间)，以及最早一条待写入记录的时间
+        self._pending_reading_history: List[tuple] = []
+        self._pending_search_history: List[tuple] = []
+        self._history_pending_since: float | None = None
+        self._history_flush_lock = asyncio.Lock()
+        self._history_flusher: asyncio.Task | None = None
     
     async def get_user_by_username(self, username: str) -> Dict[str, Any] | None:
         """根据用户名获取用户"""
-        db = await self.connection.get_connection()
-        try:
-            query = "SELECT * FROM users WHERE username = ?"
+        async with self.connection.acquire() as db:
+            query = f"SELECT {_USER_COLUMNS} FROM users WHERE username = ?"
             async with db.execute(query, (username,)) as cursor:
                 row = await cursor.fetchone()
                 if row:
                     return self._format_user_data(row)
                 return None
-        finally:
-            await db.close()
+    
+    async def get_user_auth_record(self, username: str) -> Dict[str, Any] | None:
+        """获取登录校验所需的用户ID和密码哈希，不读取和解析其余字段"""
+        async with self.connection.acquire() as db:
+            query = "SELECT id, password_hash FROM users WHERE username = ?"
+            async with db.execute(query, (username,)) as cursor:
+                row = await cursor.fetchone()
+                if row:
+                    return {"id": row[0], "username": username, "password_hash": row[1]}
+                return None
     
     async def get_user_by_email(self, email: str) -> Dict[str, Any] | None:
         """根据邮箱获取用户"""
-        db = await self.connection.get_connection()
-        try:
-            query = "SELECT * FROM users WHERE email = ?"
+        async with self.connection.acquire() as db:
+            query = f"SELECT {_USER_COLUMNS} FROM users WHERE email = ?"
             async with db.execute(query, (email,)) as cursor:
                 row = await cursor.fetchone()
                 if row:
                     return self._format_user_data(row)
                 return None
-        finally:
-            await db.close()
     
     async def get_user_by_id(self, user_id: str) -> Dict[str, Any] | None:
         """根据ID获取用户"""
-        db = await self.connection.get_connection()
-        try:
-            query = "SELECT * FROM users WHERE id = ?"
+        async with self.connection.acquire() as db:
+            query = f"SELECT {_USER_COLUMNS} FROM users WHERE id = ?"
             async with db.execute(query, (user_id,)) as cursor:
                 row = await cursor.fetchone()
                 if row:
                     return self._format_user_data(row)
                 return None
-        finally:
-            await db.close()
+    
+    async def get_user_preference_profile(self, user_id: str) -> Dict[str, Any] | None:
+        """
+        获取用于搜索结果个性化重排序的用户偏好画像
+        
+        画像包含用户信息、关注作者集合和阅读历史集合，按TTL缓存，
+        并在研究兴趣、关注作者、阅读历史发生变化时失效
+        """
+        cached = self._preference_profiles.get(user_id)
+        if cached and cached[0] > time.time():
+            return cached[1]
+        
+        user_data = await self.get_user_by_id(user_id)
+        if not user_data:
+            return None
+        
+        profile = {
+            **user_data,
+            "followed_authors": frozenset(await self.get_followed_authors(user_id)),
+            "reading_history": frozenset(await self.get_reading_history(user_id))
+        }
+        self._preference_profiles[user_id] = (time.time() + self.PREFERENCE_PROFILE_TTL_SECONDS, profile)
+        return profile
+    
+    def get_cached_dashboard(self, user_id: str) -> tuple | None:
+        """获取缓存的工作台概览，返回 (ETag, 响应内容)，无缓存或已过期时返回None"""
+        cached = self._dashboard_cache.get(user_id)
+        if cached and cached[0] > time.time():
+            return cached[1], cached[2]
+        return None
+    
+    def cache_dashboard(self, user_id: str, etag: str, payload: Dict[str, Any]):
+        """缓存已组装好的工作台概览"""
+        self._dashboard_cache[user_id] = (time.time() + self.DASHBOARD_CACHE_TTL_SECONDS, etag, payload)
+    
+    def get_cached_recommendations(self, user_id: str, key: tuple) -> List[Dict[str, Any]] | None:
+        """获取缓存的每日推荐，无缓存或已过期时返回None"""
+        cached = self._recommendation_cache.get(user_id, {}).get(key)
+        if cached and cached[0] > time.time():
+            return cached[1]
+        return None
+    
+    def cache_recommendations(self, user_id: str, key: tuple, recommendations: List[Dict[str, Any]]):
+        """缓存用户的每日推荐"""
+        self._recommendation_cache.setdefault(user_id, {})[key] = (
+            time.time() + self.RECOMMENDATION_CACHE_TTL_SECONDS, recommendations
+        )
+    
+    def _invalidate_user_caches(self, user_id: str):
+        """用户数据发生变化时，使偏好画像、工作台概览和每日推荐缓存失效"""
+        self._preference_profiles.pop(user_id, None)
+        self._dashboard_cache.pop(user_id, None)
+        self._recommendation_cache.pop(user_id, None)
     
     async def get_user_count(self) -> int:
         """获取用户总数"""
-        db = await self.connection.get_connection()
-        try:
+        async with self.connection.acquire() as db:
             query = "SELECT COUNT(*) FROM users"
             async with db.execute(query) as cursor:
                 row = await cursor.fetchone()
                 return row[0] if row else 0
-        finally:
-            await db.close()
     
     async def get_users(self, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
         """获取用户列表"""
-        db = await self.connection.get_connection()
-        try:
-            query = "SELECT * FROM users ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        async with self.connection.acquire() as db:
+            query = f"SELECT {_USER_COLUMNS} FROM users ORDER BY created_at DESC LIMIT ? OFFSET ?"
             async with db.execute(query, (limit, offset)) as cursor:
                 rows = await cursor.fetchall()
                 users = []
@@ -426,8 +975,6 @@ class UserManager:
                     if user_data:
                         users.append(user_data)
                 return users
-        finally:
-            await db.close()
     
     async def create_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """创建新用户"""
@@ -435,10 +982,9 @@ class UserManager:
         created_at = datetime.now().isoformat()
         
         # 处理研究兴趣（转为JSON字符串）
-        research_interests = json.dumps(user_data.get("research_interests", []))
+        research_interests = _json_dumps(user_data.get("research_interests", []))
         
-        db = await self.connection.get_connection()
-        try:
+        async with self.connection.acquire() as db:
             query = """
                 INSERT INTO users (id, username, email, password_hash, full_name, 
                                  affiliation, research_interests, created_at, updated_at)
@@ -457,78 +1003,143 @@ class UserManager:
             )
             await db.execute(query, values)
             await db.commit()
-            
-            # 返回创建的用户数据
-            return await self.get_user_by_id(user_id)
-        finally:
-            await db.close()
+        
+        # 直接用已写入的值构造返回数据，无需再查询一次
+        return {
+            "id": user_id,
+            "username": user_data["username"],
+            "email": user_data["email"],
+            "password_hash": user_data["password_hash"],
+            "full_name": user_data.get("full_name"),
+            "affiliation": user_data.get("affiliation"),
+            "research_interests": user_data.get("research_interests") or [],
+            "created_at": created_at,
+            "last_login": None,
+            "updated_at": created_at
+        }
     
     async def update_user(self, user_id: str, update_data: Dict[str, Any]) -> Dict[str, Any] | None:
-        """更新用户信息"""
-        db = await self.connection.get_connection()
-        try:
-            # 构建更新查询
+        """更新用户信息，返回合并更新内容后的用户数据"""
+        async with self.connection.acquire() as db:
+            async with db.execute(f"SELECT {_USER_COLUMNS} FROM users WHERE id = ?", (user_id,)) as cursor:
+                user = self._format_user_data(await cursor.fetchone())
+            if not user or not update_data:
+                return user
+            
+            # 构建更新查询，同时在内存中合并更新后的用户数据
             update_fields = []
             values = []
             
             for field, value in update_data.items():
-                if field == "research_interests" and isinstance(value, list):
-                    value = json.dumps(value)
+                if field == "research_interests":
+                    user[field] = value if isinstance(value, list) else _safe_json_loads(value)
+                    if isinstance(value, list):
+                        value = _json_dumps(value)
+                else:
+                    user[field] = value
                 update_fields.append(f"{field} = ?")
                 values.append(value)
             
-            if not update_fields:
-                return await self.get_user_by_id(user_id)
-            
             # 添加更新时间
+            updated_at = datetime.now().isoformat()
+            user["updated_at"] = updated_at
             update_fields.append("updated_at = ?")
-            values.append(datetime.now().isoformat())
+            values.append(updated_at)
             values.append(user_id)
             
             query = f"UPDATE users SET {', '.join(update_fields)} WHERE id = ?"
             await db.execute(query, values)
             await db.commit()
+            self._invalidate_user_caches(user_id)
             
-            return await self.get_user_by_id(user_id)
-        finally:
-            await db.close()
+            return user
     
     async def update_last_login(self, user_id: str):
         """更新最后登录时间"""
         await self.update_user(user_id, {"last_login": datetime.now().isoformat()})
     
-    # 收藏管理
-    async def add_bookmark(self, user_id: str, paper_id: str) -> bool:
-        """添加论文收藏"""
-        db = await self.connection.get_connection()
-        try:
+    async def get_user_stats(self, user_id: str) -> Dict[str, int]:
+        """用一次聚合查询获取用户的收藏、收藏夹、关注和阅读历史数量"""
+        await self.flush_history()
+        async with self.connection.acquire() as db:
             query = """
-                INSERT OR IGNORE INTO user_bookmarks (user_id, paper_id, created_at)
-                VALUES (?, ?, ?)
+                SELECT
+                    (SELECT COUNT(*) FROM user_bookmarks WHERE user_id = ?),
+                    (SELECT COUNT(*) FROM user_folders WHERE user_id = ?),
+                    (SELECT COUNT(*) FROM user_follows WHERE user_id = ?),
+                    (SELECT COUNT(DISTINCT paper_id) FROM user_reading_history WHERE user_id = ?)
             """
-            await db.execute(query, (user_id, paper_id, datetime.now().isoformat()))
-            await db.commit()
-            return True
-        except Exception:
-            return False
-        finally:
-            await db.close()
+            async with db.execute(query, (user_id, user_id, user_id, user_id)) as cursor:
+                row = await cursor.fetchone()
+                return {
+                    "total_bookmarks": row[0],
+                    "total_folders": row[1],
+                    "followed_authors_count": row[2],
+                    "reading_history_count": row[3]
+                }
+    
+    # 收藏管理
+    async def add_bookmark(self, user_id: str, paper_id: str) -> bool:
+        """
+        添加论文收藏
+        
+        依靠 UNIQUE(user_id, paper_id) 约束判重：已收藏时 INSERT OR IGNORE 不插入任何行，返回False
+        """
+        async with self.connection.acquire() as db:
+            try:
+                query = """
+                    INSERT OR IGNORE INTO user_bookmarks (user_id, paper_id, created_at)
+                    VALUES (?, ?, ?)
+                """
+                cursor = await db.execute(query, (user_id, paper_id, datetime.now().isoformat()))
+                await db.commit()
+                if cursor.rowcount == 0:
+                    return False
+                self._invalidate_user_caches(user_id)
+                return True
+            except Exception:
+                return False
+    
+    async def add_bookmarks_bulk(self, user_id: str, paper_ids: List[str]) -> int:
+        """
+        批量添加论文收藏，返回新增的收藏数量
+        
+        论文ID列表以一个JSON数组参数传入，由json_each展开，一条语句、一次提交完成，
+        不受绑定参数数量上限影响；已收藏的论文由 UNIQUE 约束忽略
+        """
+        if not paper_ids:
+            return 0
+        async with self.connection.acquire() as db:
+            try:
+                query = """
+                    INSERT OR IGNORE INTO user_bookmarks (user_id, paper_id, created_at)
+                    SELECT ?, value, ? FROM json_each(?)
+                """
+                cursor = await db.execute(
+                    query, (user_id, datetime.now().isoformat(), _json_dumps(list(paper_ids)))
+                )
+                await db.commit()
+                if cursor.rowcount > 0:
+                    self._invalidate_user_caches(user_id)
+                return max(cursor.rowcount, 0)
+            except Exception as e:
+                logger.error(f"批量添加收藏失败: {e}")
+                return 0
     
     async def remove_bookmark(self, user_id: str, paper_id: str) -> bool:
         """移除论文收藏"""
-        db = await self.connection.get_connection()
-        try:
+        async with self.connection.acquire() as db:
             query = "DELETE FROM user_bookmarks WHERE user_id = ? AND paper_id = ?"
             cursor = await db.execute(query, (user_id, paper_id))
             await db.commit()
-            return cursor.rowcount > 0
-        finally:
-            await db.close()
+            if cursor.rowcount == 0:
+                return False
+            self._invalidate_user_caches(user_id)
+            return True
     
     async def get_user_bookmarks(self, user_id: str) -> List[str]:
         """获取用户收藏的论文ID列表"""
-        db = await self.connection.get_connection()
-        try:
+        async with self.connection.acquire() as db:
             query = """
                 SELECT paper_id FROM user_bookmarks 
                 WHERE user_id = ? 
@@ -537,52 +1148,51 @@ class UserManager:
             async with db.execute(query, (user_id,)) as cursor:
                 rows = await cursor.fetchall()
                 return [row[0] for row in rows]
-        finally:
-            await db.close()
     
     async def is_bookmarked(self, user_id: str, paper_id: str) -> bool:
         """检查论文是否已收藏"""
-        db = await self.connection.get_connection()
-        try:
+        async with self.connection.acquire() as db:
             query = "SELECT 1 FROM user_bookmarks WHERE user_id = ? AND paper_id = ?"
             async with db.execute(query, (user_id, paper_id)) as cursor:
                 row = await cursor.fetchone()
                 return row is not None
-        finally:
-            await db.close()
     
     # 关注管理
     async def follow_author(self, user_id: str, author_id: str) -> bool:
-        """关注作者"""
-        db = await self.connection.get_connection()
-        try:
-            query = """
-                INSERT OR IGNORE INTO user_follows (user_id, author_id, created_at)
-                VALUES (?, ?, ?)
-            """
-            await db.execute(query, (user_id, author_id, datetime.now().isoformat()))
-            await db.commit()
-            return True
-        except Exception:
-            return False
-        finally:
-            await db.close()
+        """
+        关注作者
+        
+        与 add_bookmark 相同，依靠 UNIQUE(user_id, author_id) 约束判重：已关注时不插入任何行，返回False
+        """
+        async with self.connection.acquire() as db:
+            try:
+                query = """
+                    INSERT OR IGNORE INTO user_follows (user_id, author_id, created_at)
+                    VALUES (?, ?, ?)
+                """
+                cursor = await db.execute(query, (user_id, author_id, datetime.now().isoformat()))
+                await db.commit()
+                if cursor.rowcount == 0:
+                    return False
+                self._invalidate_user_caches(user_id)
+                return True
+            except Exception:
+                return False
     
     async def unfollow_author(self, user_id: str, author_id: str) -> bool:
         """取消关注作者"""
-        db = await self.connection.get_connection()
-        try:
+        async with self.connection.acquire() as db:
             query = "DELETE FROM user_follows WHERE user_id = ? AND author_id = ?"
             cursor = await db.execute(query, (user_id, author_id))
             await db.commit()
-            return cursor.rowcount > 0
-        finally:
-            await db.close()
+            if cursor.rowcount == 0:
+                return False
+            self._invalidate_user_caches(user_id)
+            return True
     
     async def get_followed_authors(self, user_id: str) -> List[str]:
         """获取关注的作者ID列表"""
-        db = await self.connection.get_connection()
-        try:
+        async with self.connection.acquire() as db:
             query = """
                 SELECT author_id FROM user_follows 
                 WHERE user_id = ? 
@@ -591,57 +1201,200 @@ class UserManager:
             async with db.execute(query, (user_id,)) as cursor:
                 rows = await cursor.fetchall()
                 return [row[0] for row in rows]
-        finally:
-            await db.close()
     
     # 阅读历史
     async def add_reading_history(self, user_id: str, paper_id: str):
-        """添加阅读历史"""
-        db = await self.connection.get_connection()
-        try:
-            query = """
-                INSERT INTO user_reading_history (user_id, paper_id, created_at)
-                VALUES (?, ?, ?)
-            """
-            await db.execute(query, (user_id, paper_id, datetime.now().isoformat()))
-            await db.commit()
-        finally:
-            await db.close()
+        """
+        添加阅读历史
+        
+        记录先进入写缓冲，由 flush_history 批量写入；重复阅读同一论文时先删除旧记录再插入（移到最前），
+        每个用户每篇论文只保留一条记录，避免历史表随重复阅读无限增长
+        """
+        self._pending_reading_history.append((user_id, paper_id, datetime.now().isoformat()))
+        self._invalidate_user_caches(user_id)
+        await self._maybe_flush_history()
     
-    async def get_reading_history(self, user_id: str, limit: int = 50) -> List[str]:
-        """获取阅读历史"""
-        db = await self.connection.get_connection()
-        try:
+    async def get_reading_history(self, user_id: str, limit: int = 50, offset: int = 0) -> List[str]:
+        """获取阅读历史（最新的在前），offset 用于分页"""
+        await self.flush_history()
+        async with self.connection.acquire() as db:
             query = """
                 SELECT DISTINCT paper_id FROM user_reading_history 
                 WHERE user_id = ? 
                 ORDER BY created_at DESC 
-                LIMIT ?
+                LIMIT ? OFFSET ?
             """
-            async with db.execute(query, (user_id, limit)) as cursor:
+            async with db.execute(query, (user_id, limit, offset)) as cursor:
                 rows = await cursor.fetchall()
                 return [row[0] for row in rows]
-        finally:
-            await db.close()
     
     # 搜索历史
     async def add_search_history(self, user_id: str, query: str):
-        """添加搜索历史"""
-        db = await self.connection.get_connection()
-        try:
-            insert_query = """
-                INSERT INTO user_search_history (user_id, query, created_at)
-                VALUES (?, ?, ?)
-            """
-            await db.execute(insert_query, (user_id, query, datetime.now().isoformat()))
-            await db.commit()
-        finally:
-            await db.close()
+        """添加搜索历史（先进入写缓冲，由 flush_history 批量写入）"""
+        self._pending_search_history.append((user_id, query, datetime.now().isoformat()))
+        await self._record_trending_query(query)
+        await self._maybe_flush_history()
+    
+    async def _maybe_flush_history(self):
+        """缓冲条数或等待时间达到阈值时写入历史记录"""
+        now = time.monotonic()
+        if self._history_pending_since is None:
+            self._history_pending_since = now
+        pending = len(self._pending_reading_history) + len(self._pending_search_history)
+        if (pending >= self.HISTORY_FLUSH_SIZE
+                or now - self._history_pending_since >= self.HISTORY_FLUSH_INTERVAL_SECONDS):
+            await self.flush_history()
+    
+    async def flush_history(self):
+        """
+        将缓冲的阅读/搜索历史在一个事务中批量写入
+        
+        读取历史相关数据前会先调用，保证读到刚写入的记录。写入失败时回滚事务：
+        个别记录违反约束（如用户或论文已被删除）时改为逐条写入，只丢弃出错的记录；
+        数据库被锁等其他错误时把记录放回缓冲，等下次再写，不会丢失整批记录
+        """
+        if not self._pending_reading_history and not self._pending_search_history:
+            return
+        async with self._history_flush_lock:
+            reading, self._pending_reading_history = self._pending_reading_history, []
+            searches, self._pending_search_history = self._pending_search_history, []
+            self._history_pending_since = None
+            # 同一批次内重复阅读同一论文只保留最后一次
+            latest_reads = {(user_id, paper_id): created_at for user_id, paper_id, created_at in reading}
+            if not latest_reads and not searches:
+                return
+            async with self.connection.acquire() as db:
+                try:
+                    if latest_reads:
+                        await db.executemany(
+                            "DELETE FROM user_reading_history WHERE user_id = ? AND paper_id = ?",
+                            list(latest_reads)
+                        )
+                        await db.executemany(
+                            "INSERT INTO user_reading_history (user_id, paper_id, created_at) VALUES (?, ?, ?)",
+                            [(user_id, paper_id, created_at)
+                             for (user_id, paper_id), created_at in latest_reads.items()]
+                        )
+                    if searches:
+                        await db.executemany(
+                            "INSERT INTO user_search_history (user_id, query, created_at) VALUES (?, ?, ?)",
+                            searches
+                        )
+                    await db.commit()
+                except sqlite3.IntegrityError as e:
+                    await db.rollback()
+                    logger.warning(f"批量写入历史记录失败，改为逐条写入: {e}")
+                    await self._write_history_records(db, latest_reads, searches)
+                except Exception as e:
+                    await db.rollback()
+                    logger.error(f"写入历史记录失败，稍后重试: {e}")
+                    self._requeue_history(
+                        [(user_id, paper_id, created_at) for (user_id, paper_id), created_at in latest_reads.items()],
+                        searches
+                    )
+    
+    async def _write_history_records(self, db: aiosqlite.Connection, latest_reads: Dict[tuple, str],
+                                     searches: List[tuple]):
+        """逐条写入历史记录：违反约束的记录记录日志后丢弃，遇到其他错误时把剩余记录放回缓冲"""
+        reading = [(user_id, paper_id, created_at) for (user_id, paper_id), created_at in latest_reads.items()]
+        for i, (user_id, paper_id, created_at) in enumerate(reading):
+            try:
+                await db.execute(
+                    "DELETE FROM user_reading_history WHERE user_id = ? AND paper_id = ?",
+                    (user_id, paper_id)
+                )
+                await db.execute(
+                    "INSERT INTO user_reading_history (user_id, paper_id, created_at) VALUES (?, ?, ?)",
+                    (user_id, paper_id, created_at)
+                )
+                await db.commit()
+            except sqlite3.IntegrityError as e:
+                await db.rollback()
+                logger.warning(f"丢弃无效的阅读历史 {user_id}/{paper_id}: {e}")
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"写入历史记录失败，稍后重试: {e}")
+                self._requeue_history(reading[i:], searches)
+                return
+        for i, record in enumerate(searches):
+            try:
+                await db.execute(
+                    "INSERT INTO user_search_history (user_id, query, created_at) VALUES (?, ?, ?)",
+                    record
+                )
+                await db.commit()
+            except sqlite3.IntegrityError as e:
+                await db.rollback()
+                logger.warning(f"丢弃无效的搜索历史 {record[0]}: {e}")
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"写入历史记录失败，稍后重试: {e}")
+                self._requeue_history([], searches[i:])
+                return
+    
+    def _requeue_history(self, reading: List[tuple], searches: List[tuple]):
+        """把未写入的历史记录放回缓冲队首，保持原有顺序"""
+        self._pending_reading_history[:0] = reading
+        self._pending_search_history[:0] = searches
+        if self._history_pending_since is None:
+            self._history_pending_since = time.monotonic()
+    
+    async def _run_history_flusher(self):
+        """后台定期写入缓冲的历史记录"""
+        while True:
+            await asyncio.sleep(self.HISTORY_FLUSH_INTERVAL_SECONDS)
+            await self.flush_history()
+    
+    def start_history_flusher(self):
+        """启动后台历史写入任务（应用启动时调用）"""
+        if self._history_flusher is None or self._history_flusher.done():
+            self._history_flusher = asyncio.create_task(self._run_history_flusher())
+    
+    async def stop_history_flusher(self):
+        """停止后台历史写入任务并写入剩余记录"""
+        if self._history_flusher is not None:
+            self._history_flusher.cancel()
+            try:
+                await self._history_flusher
+            except asyncio.CancelledError:
+                pass
+            self._history_flusher = None
+        await self.flush_history()
+    
+    async def _record_trending_query(self, query: str):
+        """将查询词计入热门搜索统计"""
+        query = query.strip()
+        if not query:
+            return
+        
+        now = time.time()
+        async with self._trending_lock:
+            self._trending_window.append((now, query))
+            self._trending_counts[query] += 1
+            self._expire_trending_queries(now)
+    
+    def _expire_trending_queries(self, now: float):
+        """移除滚动窗口之外的查询记录（调用方需持有锁）"""
+        cutoff = now - self.TRENDING_WINDOW_SECONDS
+        while self._trending_window and self._trending_window[0][0] < cutoff:
+            _, expired_query = self._trending_window.popleft()
+            self._trending_counts[expired_query] -= 1
+            if self._trending_counts[expired_query] <= 0:
+                del self._trending_counts[expired_query]
+    
+    async def get_trending_searches(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """获取滚动窗口内的热门搜索词"""
+        async with self._trending_lock:
+            self._expire_trending_queries(time.time())
+            return [
+                {"query": query, "count": count}
+                for query, count in self._trending_counts.most_common(limit)
+            ]
     
     async def get_search_history(self, user_id: str, limit: int = 20) -> List[str]:
         """获取搜索历史"""
-        db = await self.connection.get_connection()
-        try:
+        await self.flush_history()
+        async with self.connection.acquire() as db:
             query = """
                 SELECT DISTINCT query FROM user_search_history 
                 WHERE user_id = ? 
@@ -651,19 +1404,15 @@ class UserManager:
             async with db.execute(query, (user_id, limit)) as cursor:
                 rows = await cursor.fetchall()
                 return [row[0] for row in rows]
-        finally:
-            await db.close()
     
     async def clear_search_history(self, user_id: str) -> bool:
         """清除用户的搜索历史"""
-        db = await self.connection.get_connection()
-        try:
+        await self.flush_history()
+        async with self.connection.acquire() as db:
             query = "DELETE FROM user_search_history WHERE user_id = ?"
             cursor = await db.execute(query, (user_id,))
             await db.commit()
             return cursor.rowcount > 0
-        finally:
-            await db.close()
     
     # 收藏夹管理
     async def create_folder(self, user_id: str, folder_data: Dict[str, Any]) -> Dict[str, Any] | None:
@@ -671,8 +1420,7 @@ class UserManager:
         folder_id = str(uuid.uuid4())
         created_at = datetime.now().isoformat()
         
-        db = await self.connection.get_connection()
-        try:
+        async with self.connection.acquire() as db:
             query = """
                 INSERT INTO user_folders (id, user_id, name, description, created_at, updated_at)
                 VALUES (?, ?, ?, ?, ?, ?)
@@ -682,6 +1430,7 @@ class UserManager:
                 folder_data.get("description"), created_at, created_at
             ))
             await db.commit()
+            self._invalidate_user_caches(user_id)
             
             return {
                 "id": folder_id,
@@ -691,15 +1440,12 @@ class UserManager:
                 "updated_at": created_at,
                 "paper_count": 0
             }
-        finally:
-            await db.close()
     
     async def get_user_folders(self, user_id: str) -> List[Dict[str, Any]]:
         """获取用户的收藏夹列表"""
-        db = await self.connection.get_connection()
-        try:
-            query = """
-                SELECT uf.*, COUNT(fp.paper_id) as paper_count
+        async with self.connection.acquire() as db:
+            query = f"""
+                SELECT {_FOLDER_COLUMNS}, COUNT(fp.paper_id) AS paper_count
                 FROM user_folders uf
                 LEFT JOIN folder_papers fp ON uf.id = fp.folder_id
                 WHERE uf.user_id = ?
@@ -708,98 +1454,145 @@ class UserManager:
             """
             async with db.execute(query, (user_id,)) as cursor:
                 rows = await cursor.fetchall()
-                folders = []
-                for row in rows:
-                    folders.append({
-                        "id": row[0],
-                        "user_id": row[1],
-                        "name": row[2],
-                        "description": row[3],
-                        "created_at": row[4],
-                        "updated_at": row[5],
-                        "paper_count": row[6]
-                    })
-                return folders
-        finally:
-            await db.close()
+                return [self._format_folder_data(row) for row in rows]
     
-    async def add_paper_to_folder(self, folder_id: str, paper_id: str) -> bool:
-        """将论文添加到收藏夹"""
-        db = await self.connection.get_connection()
-        try:
-            query = """
-                INSERT OR IGNORE INTO folder_papers (folder_id, paper_id, added_at)
-                VALUES (?, ?, ?)
+    async def get_user_folder(self, user_id: str, folder_id: str) -> Dict[str, Any] | None:
+        """按ID获取用户的单个收藏夹（主键查询，无需遍历收藏夹列表）"""
+        async with self.connection.acquire() as db:
+            query = f"""
+                SELECT {_FOLDER_COLUMNS}, COUNT(fp.paper_id) AS paper_count
+                FROM user_folders uf
+                LEFT JOIN folder_papers fp ON uf.id = fp.folder_id
+                WHERE uf.id = ? AND uf.user_id = ?
+                GROUP BY uf.id
             """
-            await db.execute(query, (folder_id, paper_id, datetime.now().isoformat()))
-            await db.commit()
-            return True
-        except Exception:
-            return False
-        finally:
-            await db.close()
+            async with db.execute(query, (folder_id, user_id)) as cursor:
+                row = await cursor.fetchone()
+                if not row:
+                    return None
+                return self._format_folder_data(row)
+    
+    async def add_paper_to_folder(self, folder_id: str, paper_id: str) -> bool:
+        """
+        将论文添加到收藏夹
+        
+        folder_papers 表没有唯一约束，INSERT OR IGNORE 无法判重，
+        因此用 NOT EXISTS 在同一条语句中判重（走(folder_id, paper_id)复合索引），论文已在收藏夹中时返回False
+        """
+        async with self.connection.acquire() as db:
+            try:
+                query = """
+                    INSERT INTO folder_papers (folder_id, paper_id, added_at)
+                    SELECT ?, ?, ?
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM folder_papers WHERE folder_id = ? AND paper_id = ?
+                    )
+                """
+                cursor = await db.execute(
+                    query, (folder_id, paper_id, datetime.now().isoformat(), folder_id, paper_id)
+                )
+                await db.commit()
+                return cursor.rowcount > 0
+            except Exception:
+                return False
+    
+    async def add_papers_to_folder_bulk(self, folder_id: str, paper_ids: List[str]) -> int:
+        """
+        批量将论文添加到收藏夹，返回新增的论文数量
+        
+        与 add_paper_to_folder 一样用 NOT EXISTS 判重，列表内的重复ID由 DISTINCT 去掉
+        """
+        if not paper_ids:
+            return 0
+        async with self.connection.acquire() as db:
+            try:
+                query = """
+                    INSERT INTO folder_papers (folder_id, paper_id, added_at)
+                    SELECT ?1, ids.value, ?2
+                    FROM (SELECT DISTINCT value FROM json_each(?3)) AS ids
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM folder_papers WHERE folder_id = ?1 AND paper_id = ids.value
+                    )
+                """
+                cursor = await db.execute(
+                    query, (folder_id, datetime.now().isoformat(), _json_dumps(list(paper_ids)))
+                )
+                await db.commit()
+                return max(cursor.rowcount, 0)
+            except Exception as e:
+                logger.error(f"批量添加论文到收藏夹失败: {e}")
+                return 0
     
     async def remove_paper_from_folder(self, folder_id: str, paper_id: str) -> bool:
         """从收藏夹移除论文"""
-        db = await self.connection.get_connection()
-        try:
+        async with self.connection.acquire() as db:
             query = "DELETE FROM folder_papers WHERE folder_id = ? AND paper_id = ?"
             cursor = await db.execute(query, (folder_id, paper_id))
             await db.commit()
             return cursor.rowcount > 0
-        finally:
-            await db.close()
     
     async def delete_folder(self, folder_id: str, user_id: str) -> bool:
-        """删除收藏夹"""
-        db = await self.connection.get_connection()
-        try:
-            # 先删除收藏夹中的论文
-            await db.execute("DELETE FROM folder_papers WHERE folder_id = ?", (folder_id,))
-            # 再删除收藏夹
+        """删除收藏夹，收藏夹中的论文由外键ON DELETE CASCADE一并删除"""
+        async with self.connection.acquire() as db:
             cursor = await db.execute(
                 "DELETE FROM user_folders WHERE id = ? AND user_id = ?", 
                 (folder_id, user_id)
             )
             await db.commit()
+            self._invalidate_user_caches(user_id)
             return cursor.rowcount > 0
-        finally:
-            await db.close()
+    
+    def _format_folder_data(self, row) -> Dict[str, Any]:
+        """格式化收藏夹数据（按列名读取，与表中列的顺序无关）"""
+        return {
+            "id": row["id"],
+            "user_id": row["user_id"],
+            "name": row["name"],
+            "description": row["description"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+            "paper_count": row["paper_count"]
+        }
     
     def _format_user_data(self, row) -> Dict[str, Any]:
         """格式化用户数据"""
         if not row:
             return None
             
-        # 解析研究兴趣JSON
-        try:
-            research_interests = json.loads(row[6]) if row[6] else []
-        except (json.JSONDecodeError, TypeError):
-            research_interests = []
-        
         return {
-            "id": row[0],
-            "username": row[1],
-            "email": row[2],
-            "password_hash": row[3],
-            "full_name": row[4],
-            "affiliation": row[5],
-            "research_interests": research_interests,
-            "created_at": row[7],
-            "last_login": row[8],
-            "updated_at": row[9] if len(row) > 9 else None
+            "id": row["id"],
+            "username": row["username"],
+            "email": row["email"],
+            "password_hash": row["password_hash"],
+            "full_name": row["full_name"],
+            "affiliation": row["affiliation"],
+            "research_interests": _safe_json_loads(row["research_interests"]),
+            "created_at": row["created_at"],
+            "last_login": row["last_login"],
+            "updated_at": row["updated_at"]
         }
 
 
-# 全局数据库实例
+# 全局数据库实例：论文和用户数据在同一个数据库文件中，共用一个连接池，
+# 数据库初始化只执行一次，打开的连接总数也不超过一个连接池的上限
 db = RealDatabase()
-user_manager = UserManager()
+user_manager = UserManager(db.connection)
 
 # 数据库管理相关方法
+async def open_database_connections():
+    """预先打开连接池中的数据库连接并启动后台统计信息优化任务（应用启动时调用）"""
+    await db.connection.warm_up()
+    db.connection.start_optimizer()
+
+async def close_database_connections():
+    """写入缓冲的历史记录并关闭连接池中的数据库连接（应用关闭时调用）"""
+    await user_manager.stop_history_flusher()
+    await db.connection.stop_optimizer()
+    await db.connection.close()
+
 async def get_database_info():
     """获取数据库信息"""
     try:
-        from .database_manager import DatabaseManager
         db_manager = DatabaseManager(str(DB_PATH))
         return db_manager.get_database_info()
     except Exception as e:
@@ -809,7 +1602,6 @@ async def get_database_info():
 async def check_database_health():
     """检查数据库健康状态"""
     try:
-        from .database_manager import DatabaseManager
         db_manager = DatabaseManager(str(DB_PATH))
         return await db_manager.check_database_health()
     except Exception as e:
@@ -819,9 +1611,13 @@ async def check_database_health():
 async def initialize_database():
     """手动初始化数据库"""
     try:
-        from .database_manager import DatabaseManager
         db_manager = DatabaseManager(str(DB_PATH))
-        return await db_manager.initialize_database()
+        success = await db_manager.initialize_database()
+        if success:
+            # 初始化可能回填或重建了论文相关的表，丢弃按旧数据算出的统计结果和论文详情
+            db.clear_stats_cache()
+            db.clear_paper_cache()
+        return success
     except Exception as e:
         logger.error(f"手动初始化数据库失败: {str(e)}")
         return False
@@ -1,164 +1,242 @@
 """
 数据库管理模块 - 自动检测和创建缺失的表和索引
 """
+import asyncio
+import json
 import sqlite3
-import aiosqlite
+import time
+from contextlib import closing
 import os
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Iterable, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 用户数据相关表的创建语句
+USERS_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    username TEXT UNIQUE NOT NULL,
+    email TEXT UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL,
+    full_name TEXT,
+    affiliation TEXT,
+    research_interests TEXT,
+    created_at TEXT NOT NULL,
+    last_login TEXT,
+    updated_at TEXT
+)
+"""
+
+USER_FOLDERS_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_folders (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT,
+    FOREIGN KEY (user_id) REFERENCES users (id)
+)
+"""
+
+FOLDER_PAPERS_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS folder_papers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    folder_id TEXT NOT NULL,
+    paper_id TEXT NOT NULL,
+    added_at TEXT NOT NULL,
+    FOREIGN KEY (folder_id) REFERENCES user_folders (id) ON DELETE CASCADE
+)
+"""
+
+USER_FOLLOWS_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_follows (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    author_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users (id),
+    UNIQUE(user_id, author_id)
+)
+"""
+
+USER_SEARCH_HISTORY_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_search_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    query TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users (id)
+)
+"""
+
+USER_BOOKMARKS_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_bookmarks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    paper_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users (id),
+    UNIQUE(user_id, paper_id)
+)
+"""
+
+USER_READING_HISTORY_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_reading_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    paper_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users (id)
+)
+"""
+
+# 空库初始化时插入的默认用户：(id, username, email, password_hash, full_name)，created_at在插入时填写
+DEFAULT_USERS = [
+    (
+        "test_user_001",
+        "student_zhang",
+        "student@example.com",
+        "$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewdBPj4J/8QqHh2",  # password
+        "张同学",
+    ),
+]
+
+SQL_INSERT_DEFAULT_USER = """
+INSERT INTO users (id, username, email, password_hash, full_name, created_at)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
 class DatabaseManager:
     """数据库管理器 - 负责数据库的初始化、升级和维护"""
     
-    def __init__(self, db_path: str):
-        self.db_path = db_path
-        self.required_tables = {
-            'users': self._get_users_table_schema(),
-            'user_folders': self._get_user_folders_table_schema(),
-            'folder_papers': self._get_folder_papers_table_schema(),
-            'user_follows': self._get_user_follows_table_schema(),
-            'user_search_history': self._get_user_search_history_table_schema(),
-            'user_bookmarks': self._get_user_bookmarks_table_schema(),
-            'user_reading_history': self._get_user_reading_history_table_schema()
-        }
-        self.required_indexes = self._get_required_indexes()
+    # 全文检索索引的列：与搜索打分用到的标题、摘要、关键词、作者一致
+    SEARCH_INDEX_COLUMNS = ('title', 'abstract', 'keywords', 'author_names')
     
-    def _get_users_table_schema(self) -> str:
-        """获取users表的创建语句"""
-        return """
-        CREATE TABLE IF NOT EXISTS users (
-            id TEXT PRIMARY KEY,
-            username TEXT UNIQUE NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            full_name TEXT,
-            affiliation TEXT,
-            research_interests TEXT,
-            created_at TEXT NOT NULL,
-            last_login TEXT,
-            updated_at TEXT
-        )
-        """
+    # 新建连接时执行的PRAGMA：WAL允许读写并发，NORMAL同步级别在WAL下仍保证一致性，
+    # 加大页缓存和内存映射以减少全表扫描类查询的磁盘I/O，busy_timeout避免"database is locked"，
+    # foreign_keys开启外键约束（删除收藏夹时级联删除其中的论文）
+    CONNECTION_PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-64000",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA busy_timeout=5000",
+        "PRAGMA foreign_keys=ON",
+    )
     
-    def _get_user_folders_table_schema(self) -> str:
-        """获取user_folders表的创建语句"""
-        return """
-        CREATE TABLE IF NOT EXISTS user_folders (
-            id TEXT PRIMARY KEY,
-            user_id TEXT NOT NULL,
-            name TEXT NOT NULL,
-            description TEXT,
-            created_at TEXT NOT NULL,
-            updated_at TEXT,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-        """
+    # 必需的表：表名 -> 创建语句
+    REQUIRED_TABLES = {
+        'users': USERS_TABLE_SCHEMA,
+        'user_folders': USER_FOLDERS_TABLE_SCHEMA,
+        'folder_papers': FOLDER_PAPERS_TABLE_SCHEMA,
+        'user_follows': USER_FOLLOWS_TABLE_SCHEMA,
+        'user_search_history': USER_SEARCH_HISTORY_TABLE_SCHEMA,
+        'user_bookmarks': USER_BOOKMARKS_TABLE_SCHEMA,
+        'user_reading_history': USER_READING_HISTORY_TABLE_SCHEMA
+    }
     
-    def _get_folder_papers_table_schema(self) -> str:
-        """获取folder_papers表的创建语句"""
-        return """
-        CREATE TABLE IF NOT EXISTS folder_papers (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            folder_id TEXT NOT NULL,
-            paper_id TEXT NOT NULL,
-            added_at TEXT NOT NULL,
-            FOREIGN KEY (folder_id) REFERENCES user_folders (id)
-        )
-        """
+    # 初始化时还需检查是否存在的表：works由爬虫创建，其余为基于works创建的全文检索索引和关键词/机构/作者表
+    WORKS_TABLES = ('works', 'works_fts', 'work_keywords', 'work_institutions', 'work_authors')
     
-    def _get_user_follows_table_schema(self) -> str:
-        """获取user_follows表的创建语句"""
-        return """
-        CREATE TABLE IF NOT EXISTS user_follows (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id TEXT NOT NULL,
-            author_id TEXT NOT NULL,
-            created_at TEXT NOT NULL,
-            FOREIGN KEY (user_id) REFERENCES users (id),
-            UNIQUE(user_id, author_id)
-        )
-        """
+    # 必需的索引
+    REQUIRED_INDEXES = (
+        # works表：id和short_id在爬虫建表时已有主键/唯一约束，这里补充排序、筛选和统计用到的列
+        {
+            'name': 'idx_citation_count',
+            'table': 'works',
+            'columns': 'citation_count'
+        },
+        {
+            'name': 'idx_year',
+            'table': 'works',
+            'columns': 'year'
+        },
+        # 研究领域统计（GROUP BY research_field + SUM(citation_count)）可直接用覆盖索引完成；
+        # 按研究领域筛选并按引用数排序时也无需额外排序
+        {
+            'name': 'idx_works_research_field_citations',
+            'table': 'works',
+            'columns': 'research_field, citation_count'
+        },
+        # 期刊筛选按前缀匹配（LIKE 'xxx%'）；LIKE不区分大小写，索引须使用NOCASE排序规则才能用于LIKE
+        {
+            'name': 'idx_works_journal_nocase',
+            'table': 'works',
+            'columns': 'journal COLLATE NOCASE'
+        },
+        # 搜索时查询为DOI则按DOI等值查找；DOI不区分大小写
+        {
+            'name': 'idx_works_doi_nocase',
+            'table': 'works',
+            'columns': 'doi COLLATE NOCASE'
+        },
+        {
+            'name': 'idx_user_folders_user_id',
+            'table': 'user_folders',
+            'columns': 'user_id'
+        },
+        {
+            'name': 'idx_folder_papers_folder_paper',
+            'table': 'folder_papers',
+            'columns': 'folder_id, paper_id'
+        },
+        {
+            'name': 'idx_user_follows_user_id',
+            'table': 'user_follows',
+            'columns': 'user_id'
+        },
+        # 用户历史类表按 user_id 过滤并按 created_at 排序，复合索引可省去排序步骤
+        {
+            'name': 'idx_user_search_history_user_created',
+            'table': 'user_search_history',
+            'columns': 'user_id, created_at'
+        },
+        {
+            'name': 'idx_user_bookmarks_user_created',
+            'table': 'user_bookmarks',
+            'columns': 'user_id, created_at'
+        },
+        {
+            'name': 'idx_user_reading_history_user_created',
+            'table': 'user_reading_history',
+            'columns': 'user_id, created_at'
+        }
+    )
     
-    def _get_user_search_history_table_schema(self) -> str:
-        """获取user_search_history表的创建语句"""
-        return """
-        CREATE TABLE IF NOT EXISTS user_search_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id TEXT NOT NULL,
-            query TEXT NOT NULL,
-            created_at TEXT NOT NULL,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-        """
+    # get_database_info结果的缓存时间（秒）：监控会频繁调用该接口，短时间内直接返回上次的结果
+    INFO_CACHE_TTL_SECONDS = 5.0
     
-    def _get_user_bookmarks_table_schema(self) -> str:
-        """获取user_bookmarks表的创建语句"""
-        return """
-        CREATE TABLE IF NOT EXISTS user_bookmarks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id TEXT NOT NULL,
-            paper_id TEXT NOT NULL,
-            created_at TEXT NOT NULL,
-            FOREIGN KEY (user_id) REFERENCES users (id),
-            UNIQUE(user_id, paper_id)
-        )
-        """
+    # 数据库路径 -> (生成时间, 数据库信息)；每次调用都会新建DatabaseManager，因此缓存放在类上
+    _info_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
     
-    def _get_user_reading_history_table_schema(self) -> str:
-        """获取user_reading_history表的创建语句"""
-        return """
-        CREATE TABLE IF NOT EXISTS user_reading_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id TEXT NOT NULL,
-            paper_id TEXT NOT NULL,
-            created_at TEXT NOT NULL,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+    
+    def _connect(self, **kwargs) -> sqlite3.Connection:
         """
+        打开同步数据库连接并执行CONNECTION_PRAGMAS，由调用方负责关闭
+        
+        journal_mode和foreign_keys在事务中设置无效，因此须在开启事务前执行
+        """
+        conn = sqlite3.connect(self.db_path, **kwargs)
+        for pragma in self.CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
     
-    def _get_required_indexes(self) -> List[Dict[str, str]]:
-        """获取必需的索引列表"""
-        return [
-            {
-                'name': 'idx_user_folders_user_id',
-                'table': 'user_folders',
-                'columns': 'user_id'
-            },
-            {
-                'name': 'idx_folder_papers_folder_id',
-                'table': 'folder_papers',
-                'columns': 'folder_id'
-            },
-            {
-                'name': 'idx_user_follows_user_id',
-                'table': 'user_follows',
-                'columns': 'user_id'
-            },
-            {
-                'name': 'idx_user_search_history_user_id',
-                'table': 'user_search_history',
-                'columns': 'user_id'
-            },
-            {
-                'name': 'idx_user_bookmarks_user_id',
-                'table': 'user_bookmarks',
-                'columns': 'user_id'
-            },
-            {
-                'name': 'idx_user_reading_history_user_id',
-                'table': 'user_reading_history',
-                'columns': 'user_id'
-            }
-        ]
     
     async def initialize_database(self) -> bool:
-        """初始化数据库 - 创建缺失的表和索引"""
+        """初始化数据库 - 创建缺失的表和索引（在线程池中执行，不阻塞事件循环）"""
+        return await asyncio.to_thread(self.initialize_database_sync)
+    
+    def initialize_database_sync(self) -> bool:
+        """初始化数据库的同步版本，直接使用sqlite3，可在没有事件循环的场景调用"""
         try:
             logger.info(f"开始初始化数据库: {self.db_path}")
             
@@ -167,22 +245,21 @@ class DatabaseManager:
                 logger.error(f"数据库文件不存在: {self.db_path}")
                 return False
             
-            # 获取现有表列表
-            existing_tables = await self._get_existing_tables()
-            logger.info(f"现有表: {existing_tables}")
-            
-            # 创建缺失的表
-            await self._create_missing_tables(existing_tables)
-            
-            # 获取现有索引列表
-            existing_indexes = await self._get_existing_indexes()
-            logger.info(f"现有索引: {existing_indexes}")
+            # 整个初始化共用一个连接，所有DDL和回填在同一个事务中完成，只提交（fsync）一次；
+            # isolation_level=None 关闭sqlite3模块的隐式事务，由这里显式控制
+            with closing(self._connect(isolation_level=None)) as db:
+                db.execute("BEGIN IMMEDIATE")
+                try:
+                    self._initialize_schema(db)
+                    db.execute("COMMIT")
+                except BaseException:
+                    db.execute("ROLLBACK")
+                    raise
+                # 关闭连接前让SQLite按需更新查询规划器的统计信息（只分析需要的表，通常很快）
+                db.execute("PRAGMA optimize")
             
-            # 创建缺失的索引
-            await self._create_missing_indexes(existing_indexes)
-            
-            # 插入默认用户数据
-            await self._insert_default_data()
+            # 表和索引可能已变化，缓存的数据库信息失效
+            self._info_cache.pop(self.db_path, None)
             
             logger.info("数据库初始化完成")
             return True
@@ -191,78 +268,311 @@ class DatabaseManager:
             logger.error(f"数据库初始化失败: {str(e)}")
             return False
     
-    async def _get_existing_tables(self) -> List[str]:
-        """获取数据库中现有的表列表"""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = await cursor.fetchall()
-            return [table[0] for table in tables]
+    def _initialize_schema(self, db: sqlite3.Connection):
+        """
+        在调用方开启的事务中创建缺失的表、索引和辅助表
+        
+        各步骤都不自行提交，也不使用executescript（它会先提交当前事务）
+        """
+        # 获取现有表列表
+        existing_tables = self._get_existing_objects(db, 'table', (*self.REQUIRED_TABLES, *self.WORKS_TABLES))
+        logger.info(f"现有表: {sorted(existing_tables)}")
+        
+        # 创建缺失的表
+        self._create_missing_tables(db, existing_tables)
+        
+        # 旧库的folder_papers外键缺少级联删除，需要重建表（须在检查索引前完成）
+        self._migrate_folder_papers_cascade(db)
+        
+        # 获取现有索引列表
+        existing_indexes = self._get_existing_objects(
+            db, 'index', (index_info['name'] for index_info in self.REQUIRED_INDEXES)
+        )
+        logger.info(f"现有索引: {sorted(existing_indexes)}")
+        
+        # 创建缺失的索引
+        self._create_missing_indexes(db, existing_indexes)
+        
+        # 创建论文全文检索索引
+        self._create_search_index(db, existing_tables)
+        
+        # 创建论文关键词/机构/作者索引表
+        self._create_attribute_tables(db, existing_tables)
+        
+        # 插入默认用户数据
+        self._insert_default_data(db)
     
-    async def _get_existing_indexes(self) -> List[str]:
-        """获取数据库中现有的索引列表"""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute("SELECT name FROM sqlite_master WHERE type='index'")
-            indexes = await cursor.fetchall()
-            return [index[0] for index in indexes]
+    def _get_existing_objects(self, db: sqlite3.Connection, object_type: str, names: Iterable[str]) -> Set[str]:
+        """
+        查询给定名称中在数据库中已存在的表或索引（object_type为'table'或'index'）
+        
+        名称以JSON数组绑定为一个参数，只查询关心的对象，一次查询完成
+        """
+        cursor = db.execute(
+            "SELECT name FROM sqlite_master WHERE type = ? AND name IN (SELECT value FROM json_each(?))",
+            (object_type, json.dumps(list(names)))
+        )
+        return {row[0] for row in cursor.fetchall()}
     
-    async def _create_missing_tables(self, existing_tables: List[str]):
-        """创建缺失的表"""
-        async with aiosqlite.connect(self.db_path) as db:
-            for table_name, schema in self.required_tables.items():
-                if table_name not in existing_tables:
-                    logger.info(f"创建表: {table_name}")
-                    await db.execute(schema)
-                    await db.commit()
-                else:
-                    logger.info(f"表已存在: {table_name}")
+    def _get_schema_snapshot(self, db: sqlite3.Connection) -> Tuple[Set[str], Set[str]]:
+        """一次查询sqlite_master，返回已存在的必需表和必需索引"""
+        cursor = db.execute(
+            """
+            SELECT type, name FROM sqlite_master
+            WHERE (type = 'table' AND name IN (SELECT value FROM json_each(?)))
+               OR (type = 'index' AND name IN (SELECT value FROM json_each(?)))
+            """,
+            (
+                json.dumps(list(self.REQUIRED_TABLES)),
+                json.dumps([index_info['name'] for index_info in self.REQUIRED_INDEXES]),
+            )
+        )
+        existing = {'table': set(), 'index': set()}
+        for object_type, name in cursor.fetchall():
+            existing[object_type].add(name)
+        return existing['table'], existing['index']
     
-    async def _create_missing_indexes(self, existing_indexes: List[str]):
-        """创建缺失的索引"""
-        async with aiosqlite.connect(self.db_path) as db:
-            for index_info in self.required_indexes:
-                if index_info['name'] not in existing_indexes:
-                    logger.info(f"创建索引: {index_info['name']}")
-                    create_index_sql = f"CREATE INDEX {index_info['name']} ON {index_info['table']}({index_info['columns']})"
-                    await db.execute(create_index_sql)
-                    await db.commit()
-                else:
-                    logger.info(f"索引已存在: {index_info['name']}")
+    def _create_missing_tables(self, db: sqlite3.Connection, existing_tables: Set[str]):
+        """创建缺失的表（完成后汇总记录一条日志）"""
+        created = []
+        skipped = []
+        for table_name, schema in self.REQUIRED_TABLES.items():
+            if table_name not in existing_tables:
+                db.execute(schema)
+                created.append(table_name)
+            else:
+                skipped.append(table_name)
+        logger.info(f"创建表: {created}；已存在: {skipped}")
     
-    async def _insert_default_data(self):
+    def _migrate_folder_papers_cascade(self, db: sqlite3.Connection):
+        """
+        为folder_papers的folder_id外键加上ON DELETE CASCADE
+        
+        SQLite不支持修改外键，只能重建表；不属于任何收藏夹的残留记录不再保留。
+        表上的索引随旧表一起删除，之后由_create_missing_indexes重新创建。
+        重建在初始化的事务中进行，失败时随整个初始化一起回滚
+        """
+        cursor = db.execute("PRAGMA foreign_key_list(folder_papers)")
+        foreign_keys = cursor.fetchall()
+        # foreign_key_list的列依次为 id, seq, table, from, to, on_update, on_delete, match
+        if any(fk[2] == 'user_folders' and fk[6] == 'CASCADE' for fk in foreign_keys):
+            return
+        
+        logger.info("重建表: folder_papers（收藏夹删除时级联删除论文）")
+        db.execute("ALTER TABLE folder_papers RENAME TO folder_papers_old")
+        db.execute(FOLDER_PAPERS_TABLE_SCHEMA)
+        db.execute("""
+            INSERT INTO folder_papers (id, folder_id, paper_id, added_at)
+            SELECT id, folder_id, paper_id, added_at FROM folder_papers_old
+            WHERE folder_id IN (SELECT id FROM user_folders)
+        """)
+        db.execute("DROP TABLE folder_papers_old")
+    
+    def _create_missing_indexes(self, db: sqlite3.Connection, existing_indexes: Set[str]):
+        """
+        创建缺失的索引（完成后汇总记录一条日志）
+        
+        新建索引后对相应的表执行ANALYZE，让查询规划器拿到新索引的统计信息，
+        否则在sqlite_stat1中没有记录的索引可能不会被选用
+        """
+        indexed_tables = set()
+        created = []
+        skipped = []
+        for index_info in self.REQUIRED_INDEXES:
+            if index_info['name'] not in existing_indexes:
+                create_index_sql = f"CREATE INDEX {index_info['name']} ON {index_info['table']}({index_info['columns']})"
+                db.execute(create_index_sql)
+                indexed_tables.add(index_info['table'])
+                created.append(index_info['name'])
+            else:
+                skipped.append(index_info['name'])
+        logger.info(f"创建索引: {created}；已存在: {skipped}")
+        
+        for table in sorted(indexed_tables):
+            db.execute(f"ANALYZE {table}")
+    
+    def _create_search_index(self, db: sqlite3.Connection, existing_tables: Set[str]):
+        """
+        创建论文的FTS5全文索引（外部内容表，数据仍存放在works表中）
+        
+        索引SEARCH_INDEX_COLUMNS中的列，通过触发器与works表保持同步；首次创建或索引列变化时
+        需要对已有数据重建一次索引，大库耗时较长。SQLite未编译FTS5时记录警告并跳过，搜索会回退到LIKE查询
+        
+        索引以works的rowid关联（works以TEXT主键id建表，rowid是隐式的）。VACUUM可能重新编号隐式rowid，
+        之后全文检索结果会关联到错误的论文，因此执行VACUUM后必须重建索引：
+        INSERT INTO works_fts(works_fts) VALUES ('rebuild')
+        """
+        if 'works' not in existing_tables:
+            return
+        
+        columns = ", ".join(self.SEARCH_INDEX_COLUMNS)
+        new_values = ", ".join(f"new.{column}" for column in self.SEARCH_INDEX_COLUMNS)
+        old_values = ", ".join(f"old.{column}" for column in self.SEARCH_INDEX_COLUMNS)
+        
+        try:
+            rebuild = 'works_fts' not in existing_tables
+            if not rebuild:
+                indexed_columns = tuple(row[1] for row in db.execute("PRAGMA table_info(works_fts)"))
+                if indexed_columns != self.SEARCH_INDEX_COLUMNS:
+                    # 索引列变化时删除旧的索引表和触发器后重新创建
+                    logger.info(f"全文检索索引列变化: {indexed_columns} -> {self.SEARCH_INDEX_COLUMNS}")
+                    for statement in (
+                        "DROP TRIGGER IF EXISTS works_fts_ai",
+                        "DROP TRIGGER IF EXISTS works_fts_ad",
+                        "DROP TRIGGER IF EXISTS works_fts_au",
+                        "DROP TABLE IF EXISTS works_fts",
+                    ):
+                        db.execute(statement)
+                    rebuild = True
+            
+            for statement in (
+                f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS works_fts USING fts5(
+                    {columns},
+                    content='works', content_rowid='rowid',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+                """,
+                f"""
+                CREATE TRIGGER IF NOT EXISTS works_fts_ai AFTER INSERT ON works BEGIN
+                    INSERT INTO works_fts(rowid, {columns}) VALUES (new.rowid, {new_values});
+                END
+                """,
+                f"""
+                CREATE TRIGGER IF NOT EXISTS works_fts_ad AFTER DELETE ON works BEGIN
+                    INSERT INTO works_fts(works_fts, rowid, {columns}) VALUES ('delete', old.rowid, {old_values});
+                END
+                """,
+                f"""
+                CREATE TRIGGER IF NOT EXISTS works_fts_au AFTER UPDATE OF {columns} ON works BEGIN
+                    INSERT INTO works_fts(works_fts, rowid, {columns}) VALUES ('delete', old.rowid, {old_values});
+                    INSERT INTO works_fts(rowid, {columns}) VALUES (new.rowid, {new_values});
+                END
+                """,
+            ):
+                db.execute(statement)
+            if rebuild:
+                logger.info("创建全文检索索引: works_fts")
+                db.execute("INSERT INTO works_fts(works_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"创建全文检索索引失败，搜索将使用LIKE查询: {str(e)}")
+    
+    def _create_attribute_tables(self, db: sqlite3.Connection, existing_tables: Set[str]):
+        """
+        创建论文关键词表work_keywords、机构表work_institutions和作者表work_authors
+        
+        works表中keywords、author_institutions以JSON数组文本存储，author_names由爬虫存为"; "分隔的文本
+        （也可能是JSON数组），按值筛选只能LIKE全表扫描；这里用json_each展开为一行一个值并按值建索引
+        （NOCASE，不区分大小写，同一论文的同一个值唯一），通过触发器与works表保持同步。首次创建时从已有数据回填
+        """
+        if 'works' not in existing_tables:
+            return
+        
+        # (表名, 值列名, works中的来源列, 把来源列转换为JSON数组的表达式)；{src}为来源列的引用
+        json_array = "CASE WHEN json_valid({src}) THEN {src} ELSE '[]' END"
+        # "; "分隔的文本先转义反斜杠和引号，再拼成JSON数组；转换结果仍不合法时按空数组处理
+        joined_as_json = r"""'["' || replace(replace(replace({src}, '\', '\\'), '"', '\"'), '; ', '","') || '"]'"""
+        name_list = (
+            "CASE WHEN json_valid({src}) THEN {src} "
+            "WHEN {src} IS NULL OR {src} = '' THEN '[]' "
+            f"WHEN json_valid({joined_as_json}) THEN {joined_as_json} "
+            "ELSE '[]' END"
+        )
+        attribute_tables = (
+            ('work_keywords', 'keyword', 'keywords', json_array),
+            ('work_institutions', 'institution', 'author_institutions', json_array),
+            ('work_authors', 'author_name', 'author_names', name_list),
+        )
+        for table, column, source, to_json in attribute_tables:
+            # 非字符串元素直接跳过
+            values_sql = (
+                f"SELECT new.id, value FROM json_each({to_json.format(src=f'new.{source}')}) WHERE type = 'text'"
+            )
+            # 同一论文的同一个值只保留一行（唯一索引 + 触发器中INSERT OR IGNORE），重复爬取不会让表无限增长
+            unique_index = f"idx_{table}_{column}_work_id"
+            rebuild = table not in existing_tables
+            if not rebuild and not self._get_existing_objects(db, 'index', (unique_index,)):
+                # 旧版本的表没有唯一约束，可能已有重复行或INSERT OR REPLACE残留的旧值：清空后重新回填，
+                # 并删除旧的触发器（插入语句没有OR IGNORE），下面重新创建
+                logger.info(f"重建表数据并添加唯一索引: {table}")
+                for statement in (
+                    f"DELETE FROM {table}",
+                    f"DROP INDEX IF EXISTS idx_{table}_{column}",
+                    f"DROP TRIGGER IF EXISTS {table}_ai",
+                    f"DROP TRIGGER IF EXISTS {table}_ad",
+                    f"DROP TRIGGER IF EXISTS {table}_au",
+                ):
+                    db.execute(statement)
+                rebuild = True
+            for statement in (
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    work_id TEXT NOT NULL,
+                    {column} TEXT NOT NULL COLLATE NOCASE
+                )
+                """,
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {unique_index} ON {table}({column}, work_id)",
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_work_id ON {table}(work_id)",
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON works BEGIN
+                    INSERT OR IGNORE INTO {table}(work_id, {column}) {values_sql};
+                END
+                """,
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON works BEGIN
+                    DELETE FROM {table} WHERE work_id = old.id;
+                END
+                """,
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF id, {source} ON works BEGIN
+                    DELETE FROM {table} WHERE work_id = old.id;
+                    INSERT OR IGNORE INTO {table}(work_id, {column}) {values_sql};
+                END
+                """,
+            ):
+                db.execute(statement)
+            if rebuild:
+                logger.info(f"回填数据: {table}")
+                db.execute(f"""
+                    INSERT OR IGNORE INTO {table}(work_id, {column})
+                    SELECT w.id, j.value FROM works w, json_each({to_json.format(src=f'w.{source}')}) j
+                    WHERE j.type = 'text'
+                """)
+    
+    def _insert_default_data(self, db: sqlite3.Connection):
         """插入默认数据"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # 检查是否已有用户数据
-                cursor = await db.execute("SELECT COUNT(*) FROM users")
-                count = await cursor.fetchone()
+            # 检查是否已有用户数据
+            cursor = db.execute("SELECT COUNT(*) FROM users")
+            count = cursor.fetchone()
+            
+            if count[0] == 0:
+                logger.info("插入默认用户数据")
+                created_at = datetime.now().isoformat()
+                # 所有默认用户用一条预编译语句批量插入；放在保存点中，失败时不留下部分数据，也不影响初始化的其余步骤
+                db.execute("SAVEPOINT default_data")
+                try:
+                    db.executemany(SQL_INSERT_DEFAULT_USER, [(*user, created_at) for user in DEFAULT_USERS])
+                except Exception:
+                    db.execute("ROLLBACK TO default_data")
+                    raise
+                finally:
+                    db.execute("RELEASE default_data")
+                logger.info(f"默认用户数据插入完成: {len(DEFAULT_USERS)} 个用户")
+            else:
+                logger.info("用户数据已存在，跳过默认数据插入")
                 
-                if count[0] == 0:
-                    logger.info("插入默认用户数据")
-                    # 插入测试用户
-                    test_user_sql = """
-                    INSERT INTO users (id, username, email, password_hash, full_name, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """
-                    await db.execute(test_user_sql, (
-                        "test_user_001",
-                        "student_zhang",
-                        "student@example.com",
-                        "$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewdBPj4J/8QqHh2",  # password
-                        "张同学",
-                        datetime.now().isoformat()
-                    ))
-                    await db.commit()
-                    logger.info("默认用户数据插入完成")
-                else:
-                    logger.info("用户数据已存在，跳过默认数据插入")
-                    
         except Exception as e:
             logger.warning(f"插入默认数据失败: {str(e)}")
     
     def get_database_info(self) -> Dict[str, Any]:
-        """获取数据库信息"""
+        """获取数据库信息（结果缓存INFO_CACHE_TTL_SECONDS秒，初始化数据库后失效）"""
+        cached = self._info_cache.get(self.db_path)
+        if cached is not None and time.monotonic() - cached[0] < self.INFO_CACHE_TTL_SECONDS:
+            return dict(cached[1])
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with closing(self._connect()) as conn:
                 cursor = conn.cursor()
                 
                 # 获取表信息
@@ -276,21 +586,28 @@ class DatabaseManager:
                 # 获取数据库大小
                 file_size = os.path.getsize(self.db_path)
                 
-                return {
+                info = {
                     "database_path": self.db_path,
                     "file_size_mb": round(file_size / (1024 * 1024), 2),
                     "tables": tables,
                     "indexes": indexes,
-                    "required_tables": list(self.required_tables.keys()),
-                    "required_indexes": [idx['name'] for idx in self.required_indexes]
+                    "required_tables": list(self.REQUIRED_TABLES.keys()),
+                    "required_indexes": [idx['name'] for idx in self.REQUIRED_INDEXES]
                 }
+            
+            self._info_cache[self.db_path] = (time.monotonic(), info)
+            return dict(info)
                 
         except Exception as e:
             logger.error(f"获取数据库信息失败: {str(e)}")
             return {"error": str(e)}
     
     async def check_database_health(self) -> Dict[str, Any]:
-        """检查数据库健康状态"""
+        """检查数据库健康状态（在线程池中执行，不阻塞事件循环）"""
+        return await asyncio.to_thread(self.check_database_health_sync)
+    
+    def check_database_health_sync(self) -> Dict[str, Any]:
+        """检查数据库健康状态的同步版本，直接使用sqlite3"""
         try:
             health_status = {
                 "status": "healthy",
@@ -298,10 +615,22 @@ class DatabaseManager:
                 "recommendations": []
             }
             
+            # 表/索引检查和连接检查共用一个连接
+            with closing(self._connect()) as db:
+                existing_tables, existing_indexes = self._get_schema_snapshot(db)
+                
+                # 检查数据库连接
+                try:
+                    db.execute("SELECT 1")
+                    health_status["connection"] = "ok"
+                except Exception as e:
+                    health_status["status"] = "unhealthy"
+                    health_status["connection"] = "failed"
+                    health_status["issues"].append(f"数据库连接失败: {str(e)}")
+            
             # 检查必需的表
-            existing_tables = await self._get_existing_tables()
             missing_tables = []
-            for table in self.required_tables.keys():
+            for table in self.REQUIRED_TABLES.keys():
                 if table not in existing_tables:
                     missing_tables.append(table)
             
@@ -311,9 +640,8 @@ class DatabaseManager:
                 health_status["recommendations"].append("运行数据库初始化以创建缺失的表")
             
             # 检查必需的索引
-            existing_indexes = await self._get_existing_indexes()
             missing_indexes = []
-            for index_info in self.required_indexes:
+            for index_info in self.REQUIRED_INDEXES:
                 if index_info['name'] not in existing_indexes:
                     missing_indexes.append(index_info['name'])
             
@@ -322,16 +650,6 @@ class DatabaseManager:
                 health_status["issues"].append(f"缺失必需的索引: {missing_indexes}")
                 health_status["recommendations"].append("运行数据库初始化以创建缺失的索引")
             
-            # 检查数据库连接
-            try:
-                async with aiosqlite.connect(self.db_path) as db:
-                    await db.execute("SELECT 1")
-                health_status["connection"] = "ok"
-            except Exception as e:
-                health_status["status"] = "unhealthy"
-                health_status["connection"] = "failed"
-                health_status["issues"].append(f"数据库连接失败: {str(e)}")
-            
             return health_status
             
         except Exception as e:
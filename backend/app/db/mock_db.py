@@ -3,6 +3,7 @@
 包含论文、作者、用户等完整的测试数据集
 """
 from datetime import datetime
+from types import MappingProxyType
 from typing import Dict, List, Any
 
 # 模拟作者数据
@@ -174,6 +175,11 @@ PAPERS = [
     }
 ]
 
+# 论文和作者记录只读：用只读映射包装，避免调用方意外修改共享的测试数据。
+# 用户记录会被收藏、关注、建收藏夹等操作修改，保持普通字典
+AUTHORS = tuple(MappingProxyType(author) for author in AUTHORS)
+PAPERS = tuple(MappingProxyType(paper) for paper in PAPERS)
+
 # 模拟用户数据
 USERS = [
     {
@@ -270,11 +276,47 @@ class MockDatabase:
     """模拟数据库操作类"""
     
     def __init__(self):
-        self.papers = PAPERS.copy()
-        self.authors = AUTHORS.copy()
+        self.papers = list(PAPERS)
+        self.authors = list(AUTHORS)
         self.users = USERS.copy()
         self.search_history = SEARCH_HISTORY.copy()
         self.recommendations = RECOMMENDATIONS.copy()
+        self._build_lookup_indexes()
+        # 新建用户/收藏夹的编号：从现有最大编号继续递增，无需每次统计已有数量
+        self._next_user_id = 1 + max((int(user["id"].split("_")[1]) for user in self.users), default=0)
+        self._next_folder_id = 1 + max(
+            (int(folder["id"].split("_")[1]) for user in self.users for folder in user.get("folders", [])),
+            default=0
+        )
+    
+    def _build_lookup_indexes(self):
+        """
+        构建查找索引：论文/作者/用户按ID、用户按用户名、作者的合作者集合和论文列表的字典，
+        以及搜索用的小写文本
+        """
+        self._papers_by_id: Dict[str, Dict[str, Any]] = {paper["id"]: paper for paper in self.papers}
+        self._authors_by_id: Dict[str, Dict[str, Any]] = {author["id"]: author for author in self.authors}
+        self._users_by_id: Dict[str, Dict[str, Any]] = {user["id"]: user for user in self.users}
+        self._users_by_username: Dict[str, Dict[str, Any]] = {user["username"]: user for user in self.users}
+        # 用户ID -> 收藏论文/关注作者的ID集合：列表保留原有顺序用于返回，集合用于判断是否已收藏/关注
+        self._bookmark_sets: Dict[str, set] = {user["id"]: set(user["bookmarked_papers"]) for user in self.users}
+        self._follow_sets: Dict[str, set] = {user["id"]: set(user["followed_authors"]) for user in self.users}
+        # 作者ID -> 合作者ID集合，判断是否合作、求共同合作者时用集合运算
+        self._collaborators: Dict[str, frozenset] = {
+            author["id"]: frozenset(author.get("collaboration_network", ())) for author in self.authors
+        }
+        # 作者ID -> 其论文列表（保持论文原有顺序）
+        self._papers_by_author: Dict[str, List[Dict[str, Any]]] = {}
+        for paper in self.papers:
+            for author_id in paper["authors"]:
+                self._papers_by_author.setdefault(author_id, []).append(paper)
+        
+        # 搜索用的小写文本：标题、摘要、关键词、作者拼接为一个字符串，搜索时不必逐篇逐字段转换大小写；
+        # 用"\0"分隔，避免查询词跨字段误匹配
+        self._search_haystacks: List[tuple] = [
+            (paper, "\0".join([paper["title"], paper["abstract"], *paper["keywords"], *paper["author_names"]]).lower())
+            for paper in self.papers
+        ]
     
     # 论文相关操作
     def get_papers(self, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
@@ -283,23 +325,14 @@ class MockDatabase:
     
     def get_paper_by_id(self, paper_id: str) -> Dict[str, Any] | None:
         """根据ID获取论文"""
-        for paper in self.papers:
-            if paper["id"] == paper_id:
-                return paper
-        return None
+        return self._papers_by_id.get(paper_id)
     
     def search_papers(self, query: str, filters: Dict = None) -> List[Dict[str, Any]]:
         """搜索论文"""
-        results = []
         query_lower = query.lower()
         
-        for paper in self.papers:
-            # 简单的文本匹配搜索
-            if (query_lower in paper["title"].lower() or 
-                query_lower in paper["abstract"].lower() or
-                any(query_lower in keyword.lower() for keyword in paper["keywords"]) or
-                any(query_lower in author.lower() for author in paper["author_names"])):
-                results.append(paper)
+        # 简单的文本匹配搜索
+        results = [paper for paper, haystack in self._search_haystacks if query_lower in haystack]
         
         # 应用过滤器
         if filters:
@@ -319,79 +352,84 @@ class MockDatabase:
     
     def get_author_by_id(self, author_id: str) -> Dict[str, Any] | None:
         """根据ID获取作者"""
-        for author in self.authors:
-            if author["id"] == author_id:
-                return author
-        return None
+        return self._authors_by_id.get(author_id)
     
     def get_papers_by_author(self, author_id: str) -> List[Dict[str, Any]]:
         """获取作者的论文"""
-        return [paper for paper in self.papers if author_id in paper["authors"]]
+        return list(self._papers_by_author.get(author_id, ()))
     
     # 用户相关操作
     def get_user_by_username(self, username: str) -> Dict[str, Any] | None:
         """根据用户名获取用户"""
-        for user in self.users:
-            if user["username"] == username:
-                return user
-        return None
+        return self._users_by_username.get(username)
     
     def get_user_by_id(self, user_id: str) -> Dict[str, Any] | None:
         """根据ID获取用户"""
-        for user in self.users:
-            if user["id"] == user_id:
-                return user
-        return None
+        return self._users_by_id.get(user_id)
     
     def create_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """创建用户"""
-        user_data["id"] = f"user_{len(self.users) + 1:03d}"
+        user_data["id"] = f"user_{self._next_user_id:03d}"
+        self._next_user_id += 1
         user_data["created_at"] = datetime.now().isoformat()
         user_data["folders"] = []
         user_data["followed_authors"] = []
         user_data["bookmarked_papers"] = []
         user_data["reading_history"] = []
         self.users.append(user_data)
+        self._users_by_id[user_data["id"]] = user_data
+        self._users_by_username[user_data["username"]] = user_data
+        self._bookmark_sets[user_data["id"]] = set()
+        self._follow_sets[user_data["id"]] = set()
         return user_data
     
     def update_user(self, user_id: str, update_data: Dict[str, Any]) -> Dict[str, Any] | None:
         """更新用户信息"""
-        for i, user in enumerate(self.users):
-            if user["id"] == user_id:
-                self.users[i].update(update_data)
-                return self.users[i]
-        return None
+        user = self._users_by_id.get(user_id)
+        if user is None:
+            return None
+        old_username = user["username"]
+        user.update(update_data)
+        if user["username"] != old_username:
+            # 用户名变化时同步更新用户名索引
+            self._users_by_username.pop(old_username, None)
+            self._users_by_username[user["username"]] = user
+        return user
     
     # 收藏和关注操作
     def add_bookmark(self, user_id: str, paper_id: str) -> bool:
         """添加论文收藏"""
         user = self.get_user_by_id(user_id)
-        if user and paper_id not in user["bookmarked_papers"]:
+        if user and paper_id not in self._bookmark_sets[user_id]:
             user["bookmarked_papers"].append(paper_id)
+            self._bookmark_sets[user_id].add(paper_id)
             return True
         return False
     
     def remove_bookmark(self, user_id: str, paper_id: str) -> bool:
         """移除论文收藏"""
         user = self.get_user_by_id(user_id)
-        if user and paper_id in user["bookmarked_papers"]:
+        if user and paper_id in self._bookmark_sets[user_id]:
             user["bookmarked_papers"].remove(paper_id)
+            self._bookmark_sets[user_id].discard(paper_id)
             return True
         return False
     
     def follow_author(self, user_id: str, author_id: str) -> bool:
         """关注作者"""
         user = self.get_user_by_id(user_id)
-        if user and author_id not in user["followed_authors"]:
+        if user and author_id not in self._follow_sets[user_id]:
             user["followed_authors"].append(author_id)
+            self._follow_sets[user_id].add(author_id)
             return True
         return False
     
     def unfollow_author(self, user_id: str, author_id: str) -> bool:
         """取消关注作者"""
         user = self.get_user_by_id(user_id)
-        if user and author_id in user["followed_authors"]:
+        if user and author_id in self._follow_sets[user_id]:
             user["followed_authors"].remove(author_id)
+            self._follow_sets[user_id].discard(author_id)
             return True
         return False
     
@@ -400,7 +438,8 @@ class MockDatabase:
         """创建收藏夹"""
         user = self.get_user_by_id(user_id)
         if user:
-            folder_data["id"] = f"folder_{len([f for u in self.users for f in u['folders']]) + 1:03d}"
+            folder_data["id"] = f"folder_{self._next_folder_id:03d}"
+            self._next_folder_id += 1
             folder_data["created_at"] = datetime.now().isoformat()
             folder_data["papers"] = []
             user["folders"].append(folder_data)
@@ -248,9 +248,13 @@ async def startup_event():
     """
     应用启动时的初始化操作
     """
+    from .db.database import user_manager, open_database_connections
+    
     print("🚀 学术论文推荐系统API启动中...")
     print("📚 初始化模拟数据库...")
+    await open_database_connections()
     print("🔧 配置算法模块...")
+    user_manager.start_history_flusher()
     print("✅ 系统启动完成！")
     print("📖 API文档: http://127.0.0.1:8000/docs")
 
@@ -260,9 +264,12 @@ async def shutdown_event():
     """
     应用关闭时的清理操作
     """
+    from .db.database import close_database_connections
+    
     print("🛑 学术论文推荐系统API正在关闭...")
     print("💾 保存用户数据...")
     print("🧹 清理资源...")
+    await close_database_connections()
     print("✅ 系统已安全关闭")
 
 # 中间件：请求日志
@@ -1,7 +1,8 @@
 """
 论文和作者相关的Pydantic模型
 """
-from pydantic import BaseModel, HttpUrl
+from operator import itemgetter
+from pydantic import BaseModel, ConfigDict, HttpUrl, field_validator
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
@@ -41,6 +42,17 @@ class Paper(PaperBase):
     keywords_display: Optional[str] = None
     domain: Optional[str] = None
 
+    @field_validator("topics", mode="before")
+    @classmethod
+    def _normalize_topics(cls, topics: Any) -> Any:
+        """数据库中的topics是主题名称列表，转换为 {"display_name": 名称} 形式；已是字典的保持不变"""
+        if not isinstance(topics, list):
+            return topics
+        return [
+            {"display_name": topic} if isinstance(topic, str) else topic
+            for topic in topics if isinstance(topic, (str, dict))
+        ]
+
     class Config:
         from_attributes = True
 
@@ -69,6 +81,22 @@ class PaperSummary(BaseModel):
     truth_value_score: Optional[float] = None
     research_field: str
 
+# PaperSummary的必填字段，用itemgetter一次性取出（short_id和truth_value_score可能缺失，单独用get读取）
+_PAPER_SUMMARY_FIELDS = ("id", "title", "author_names", "year", "journal", "citation_count", "research_field")
+_get_paper_summary_fields = itemgetter(*_PAPER_SUMMARY_FIELDS)
+
+def paper_to_summary(paper: Dict[str, Any]) -> PaperSummary:
+    """
+    将数据库中的论文记录转换为PaperSummary
+    
+    数据来自服务端自身，字段类型已由数据库层保证，因此使用model_construct跳过逐字段校验
+    """
+    return PaperSummary.model_construct(
+        short_id=paper.get("short_id"),
+        truth_value_score=paper.get("truth_value_score"),
+        **dict(zip(_PAPER_SUMMARY_FIELDS, _get_paper_summary_fields(paper)))
+    )
+
 class AuthorBase(BaseModel):
     """作者基础模型"""
     name: str
@@ -111,11 +139,36 @@ class AuthorSummary(BaseModel):
     citation_count: int
     paper_count: int
 
+_AUTHOR_SUMMARY_FIELDS = ("id", "name", "affiliation", "research_areas", "h_index", "citation_count", "paper_count")
+_get_author_summary_fields = itemgetter(*_AUTHOR_SUMMARY_FIELDS)
+
+def author_to_summary(author: Dict[str, Any]) -> AuthorSummary:
+    """
+    将数据库层聚合出的作者信息转换为AuthorSummary（跳过校验，同paper_to_summary）
+    """
+    return AuthorSummary.model_construct(
+        **dict(zip(_AUTHOR_SUMMARY_FIELDS, _get_author_summary_fields(author)))
+    )
+
+class SearchFilters(BaseModel):
+    """搜索过滤器模型（不支持的过滤条件直接拒绝，避免被静默忽略）"""
+    model_config = ConfigDict(extra="forbid")
+    
+    year_min: Optional[int] = None
+    year_max: Optional[int] = None
+    authors: Optional[List[str]] = None
+    journals: Optional[List[str]] = None
+    research_fields: Optional[List[str]] = None
+    keywords: Optional[List[str]] = None
+    institutions: Optional[List[str]] = None
+    min_citations: Optional[int] = None
+    min_truth_value: Optional[float] = None
+
 class SearchRequest(BaseModel):
     """搜索请求模型"""
     query: str
     search_type: str = "hybrid"  # "hybrid", "semantic", "exact"
-    filters: Optional[Dict[str, Any]] = None
+    filters: Optional[SearchFilters] = None
     sort_by: str = "relevance"  # "relevance", "date", "citation", "truth_value"
     sort_order: str = "desc"  # "asc", "desc"
     limit: int = 20
@@ -130,16 +183,6 @@ class SearchResponse(BaseModel):
     filters: Optional[Dict[str, Any]] = None
     execution_time: float
 
-class SearchFilters(BaseModel):
-    """搜索过滤器模型"""
-    year_min: Optional[int] = None
-    year_max: Optional[int] = None
-    authors: Optional[List[str]] = None
-    journals: Optional[List[str]] = None
-    research_fields: Optional[List[str]] = None
-    min_citations: Optional[int] = None
-    min_truth_value: Optional[float] = None
-
 class GraphNode(BaseModel):
     """图节点模型"""
     id: str
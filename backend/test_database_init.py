@@ -62,6 +62,7 @@ async def test_database_initialization():
         
         # 测试数据库连接
         print("🔌 测试数据库连接...")
+        from backend.app.db.database import close_database_connections
         try:
             from backend.app.db.database import db
             # 尝试获取一些数据
@@ -76,6 +77,9 @@ async def test_database_initialization():
         except Exception as e:
             print(f"❌ 数据库连接测试失败: {str(e)}")
             return False
+        finally:
+            # 连接池中的连接需要显式关闭，否则其工作线程会阻止进程退出
+            await close_database_connections()
         
         print("🎉 所有测试通过！数据库初始化功能正常工作。")
         return True
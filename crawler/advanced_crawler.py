@@ -535,10 +535,14 @@ class AsyncOpenAlexCrawler:
             columns = list(papers_data[0].keys())
             placeholders = ", ".join("?" * len(columns))
             columns_str = ", ".join(columns)
+            # 已存在的论文原地更新而不是INSERT OR REPLACE：REPLACE先删除旧行但不触发DELETE触发器，
+            # 会让works_fts全文索引和work_keywords等辅助表残留旧数据；UPDATE会触发相应的同步触发器
+            update_str = ", ".join(f"{col}=excluded.{col}" for col in columns if col != "id")
             
             insert_sql = f"""
-                INSERT OR REPLACE INTO works ({columns_str})
+                INSERT INTO works ({columns_str})
                 VALUES ({placeholders})
+                ON CONFLICT(id) DO UPDATE SET {update_str}
             """
             
             # 批量插入